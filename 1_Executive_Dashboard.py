@@ -1,39 +1,22 @@
 import streamlit as st
 import pandas as pd
-from sqlalchemy import create_engine
 
-st.set_page_config(layout="wide")
+import diagnostics
+import sql_queries
+from query_layer import aggregate
 
-# 1️⃣ Cache DB connection (very important)
-@st.cache_resource
-def get_engine():
-    return create_engine("sqlite:///amazon_india.db")
+st.set_page_config(layout="wide")
 
-engine = get_engine()
+# 1️⃣ Aggregates come from the pre-built sales cube (see query_layer)
 
-# 2️⃣ Cache aggregated queries instead of full table
-@st.cache_data(ttl=300)  # refresh every 5 mins
+# 2️⃣ Aggregated queries, cached until the next data load
 def load_kpis():
-    query = """
-    SELECT
-        SUM(final_amount_inr) AS total_revenue,
-        COUNT(DISTINCT customer_id) AS active_customers,
-        AVG(final_amount_inr) AS avg_order_value
-    FROM transactions
-    """
-    return pd.read_sql(query, engine)
-
-@st.cache_data(ttl=300)
+    totals = aggregate(**sql_queries.sales_totals())
+    customers = aggregate(**sql_queries.active_customers())
+    return pd.concat([totals, customers], axis=1)
+
 def load_yearly_revenue():
-    query = """
-    SELECT
-        order_year,
-        SUM(final_amount_inr) AS revenue
-    FROM transactions
-    GROUP BY order_year
-    ORDER BY order_year
-    """
-    return pd.read_sql(query, engine)
+    return aggregate(**sql_queries.revenue_by_year())
 
 kpis = load_kpis()
 yearly = load_yearly_revenue()
@@ -43,8 +26,10 @@ st.header("📊 Executive Summary")
 
 c1, c2, c3 = st.columns(3)
 
-c1.metric("Total Revenue", f"₹{kpis.total_revenue.iloc[0]:,.0f}")
-c2.metric("Active Customers", int(kpis.active_customers.iloc[0]))
-c3.metric("Avg Order Value", f"₹{kpis.avg_order_value.iloc[0]:,.0f}")
+c1.metric("Total Revenue", f"₹{kpis.revenue.iloc[0]:,.0f}")
+c2.metric("Active Customers", int(kpis.customers.iloc[0]))
+c3.metric("Avg Order Value", f"₹{kpis.aov.iloc[0]:,.0f}")
+
+st.line_chart(yearly.set_index("order_year"))
 
-st.line_chart(yearly.set_index("order_year"))
\ No newline at end of file
+diagnostics.sidebar()
\ No newline at end of file
@@ -1,47 +1,48 @@
-import streamlit as st
 import pandas as pd
-from sqlalchemy import create_engine
+import streamlit as st
 
-st.set_page_config(layout="wide")
+import diagnostics
+import sql_queries
+from query_layer import aggregate, column_stats, run_query
 
-# 1️⃣ Cache DB engine (created once)
-@st.cache_resource
-def get_engine():
-    return create_engine("sqlite:///amazon_india.db")
+st.set_page_config(layout="wide")
 
-engine = get_engine()
+# 1️⃣ Aggregates come from the pre-built sales cube (see query_layer)
 
-# 2️⃣ Load year range ONCE (very small query)
-@st.cache_data
+# 2️⃣ Load year range from the statistics catalogue (no table scan), falling
+#    back to MIN/MAX when the catalogue is missing or has no row for it
 def get_year_range():
-    q = "SELECT MIN(order_year) AS min_year, MAX(order_year) AS max_year FROM transactions"
-    return pd.read_sql(q, engine)
+    years = column_stats("order_year")
+    if years is None:
+        years = run_query(
+            "SELECT MIN(order_year) AS min_value, MAX(order_year) AS max_value FROM transactions"
+        ).iloc[0]
+    return years
 
 years = get_year_range()
 
 # 3️⃣ Load monthly revenue BY YEAR (cached per year)
-@st.cache_data(ttl=300)
 def load_monthly_revenue(year):
-    query = """
-    SELECT
-        order_month,
-        SUM(final_amount_inr) AS revenue
-    FROM transactions
-    WHERE order_year = :year
-    GROUP BY order_month
-    ORDER BY order_month
-    """
-    return pd.read_sql(query, engine, params={"year": year})
+    return aggregate(**sql_queries.monthly_revenue(), where={"order_year": year})
 
 # 4️⃣ UI
 st.header("📊 Revenue Analytics")
 
-year = st.slider(
-    "Year",
-    int(years.min_year.iloc[0]),
-    int(years.max_year.iloc[0])
-)
+if pd.isna(years.min_value):
+    st.warning("No transactions yet. Run load_data.py to build the database.")
+    diagnostics.sidebar()
+    st.stop()
+
+first, last = int(years.min_value), int(years.max_value)
+# A slider needs min < max; a single-year dataset just shows that year
+if first < last:
+    year = st.slider("Year", first, last)
+else:
+    year = first
+    st.caption(f"Year {year}")
 
 monthly = load_monthly_revenue(year)
 
-st.bar_chart(monthly.set_index("order_month"))
\ No newline at end of file
+st.bar_chart(monthly.set_index("order_month"))
+
+diagnostics.sidebar()
\ No newline at end of file
@@ -0,0 +1,36 @@
+import streamlit as st
+
+import cohorts
+import diagnostics
+from query_layer import run_query
+
+st.set_page_config(layout="wide")
+
+# 1️⃣ The cohort matrices are built at load time (see cohorts.py). The table
+#    lives only in amazon_india.db, whichever backend serves the other pages.
+rows = run_query(cohorts.COHORTS_SQL, backend="sqlite")
+
+# 2️⃣ UI
+st.header("🧬 Customer Cohorts")
+st.caption("Customers grouped by the month of their first order")
+
+if rows.empty:
+    st.warning("No cohorts yet. load_data.py builds them with every load.")
+    diagnostics.sidebar()
+    st.stop()
+retention, revenue = cohorts.matrices(rows)
+
+max_age = int(retention.columns.max())
+months = st.slider("Months since first order", 1, max_age, min(12, max_age)) if max_age > 1 else max_age
+view = st.radio("Show", ["Retention %", "Revenue (INR)"], horizontal=True)
+
+if view == "Retention %":
+    matrix, fmt = retention, "{:,.1f}"
+else:
+    matrix, fmt = revenue, "₹{:,.0f}"
+st.dataframe(matrix.loc[:, :months].style.background_gradient(axis=None).format(fmt, na_rep=""))
+
+st.subheader("📉 Average Retention Curve")
+st.line_chart(retention.loc[:, 1:months].mean())
+
+diagnostics.sidebar()
\ No newline at end of file
@@ -1,27 +1,19 @@
 import streamlit as st
-import pandas as pd
-from sqlalchemy import create_engine
 
-st.set_page_config(layout="wide")
+import diagnostics
+import sql_queries
+from query_layer import aggregate
 
-# 1️⃣ Cache engine
-@st.cache_resource
-def get_engine():
-    return create_engine("sqlite:///amazon_india.db")
+st.set_page_config(layout="wide")
 
-engine = get_engine()
+# 1️⃣ Aggregates come from the pre-built sales cube (see query_layer)
 
 # 2️⃣ Load ONLY aggregated data (tiny result)
-@st.cache_data(ttl=300)
 def load_prime_revenue():
-    query = """
-    SELECT
-        is_prime_member,
-        AVG(final_amount_inr) AS avg_revenue
-    FROM transactions
-    GROUP BY is_prime_member
-    """
-    return pd.read_sql(query, engine)
+    df = aggregate(**sql_queries.prime_analysis())
+    return df[["is_prime_member", "avg_order_value"]].rename(
+        columns={"avg_order_value": "avg_revenue"}
+    )
 
 prime_df = load_prime_revenue()
 
@@ -33,4 +25,6 @@ prime_df["is_prime_member"] = prime_df["is_prime_member"].map(
     {0: "Non-Prime Customers", 1: "Prime Customers"}
 )
 
-st.bar_chart(prime_df.set_index("is_prime_member"))
\ No newline at end of file
+st.bar_chart(prime_df.set_index("is_prime_member"))
+
+diagnostics.sidebar()
\ No newline at end of file
@@ -1,33 +1,22 @@
 import streamlit as st
-import pandas as pd
-from sqlalchemy import create_engine
 
-st.set_page_config(layout="wide")
+import diagnostics
+import sql_queries
+from query_layer import aggregate
 
-# 1️⃣ Cache DB engine
-@st.cache_resource
-def get_engine():
-    return create_engine("sqlite:///amazon_india.db")
+st.set_page_config(layout="wide")
 
-engine = get_engine()
+# 1️⃣ Category is a cube dimension, so no per-request products join
 
-# 2️⃣ Cache aggregated join result
-@st.cache_data(ttl=600)  # refresh every 10 mins
+# 2️⃣ Aggregated category revenue, cached until the next data load
 def load_category_revenue():
-    query = """
-    SELECT
-        p.category,
-        SUM(t.final_amount_inr) AS revenue
-    FROM transactions t
-    JOIN products p ON t.product_id = p.product_id
-    GROUP BY p.category
-    ORDER BY revenue DESC
-    """
-    return pd.read_sql(query, engine)
+    return aggregate(**sql_queries.top_categories())
 
 df = load_category_revenue()
 
 # 3️⃣ UI
 st.header("📦 Product Performance")
 
-st.bar_chart(df.set_index("category"))
\ No newline at end of file
+st.bar_chart(df.set_index("category"))
+
+diagnostics.sidebar()
\ No newline at end of file
@@ -1,66 +1,52 @@
-import streamlit as st
-import pandas as pd
-import numpy as np
-from sqlalchemy import create_engine
-from sklearn.linear_model import LinearRegression
-
-st.set_page_config(layout="wide")
-
-# 1️⃣ Cache DB engine
-@st.cache_resource
-def get_engine():
-    return create_engine("sqlite:///amazon_india.db")
-
-engine = get_engine()
-
-# 2️⃣ Load YEARLY revenue using SQL (tiny dataset)
-@st.cache_data(ttl=600)
-def load_yearly_revenue():
-    query = """
-    SELECT
-        order_year,
-        SUM(final_amount_inr) AS revenue
-    FROM transactions
-    GROUP BY order_year
-    ORDER BY order_year
-    """
-    return pd.read_sql(query, engine)
-
-yearly = load_yearly_revenue()
+import os
 
-# 3️⃣ Train model (cached)
-@st.cache_resource
-def train_model(data):
-    X = data[["order_year"]]
-    y = data["revenue"]
-    model = LinearRegression()
-    model.fit(X, y)
-    return model
+import pandas as pd
+import streamlit as st
 
-model = train_model(yearly)
+import db
+import diagnostics
+import forecasts
 
-# 4️⃣ Forecast
-future_years = np.array([[2026], [2027]])
-predictions = model.predict(future_years)
+st.set_page_config(layout="wide")
 
-forecast_df = pd.DataFrame({
-    "Year": [2026, 2027],
-    "Predicted Revenue (INR)": predictions.astype(int)
-})
+# 1️⃣ Forecasts are fitted after each data load (see forecasts.py); this page
+#    only reads the precomputed file for the current data version. Keyed on
+#    the file's mtime, so a missing file is never cached and a refit shows up.
+@st.cache_data
+def load_forecasts(path, mtime):
+    return pd.read_parquet(path)
 
-# 5️⃣ UI
 st.header("🔮 Predictive Analytics")
 
-c1, c2 = st.columns(2)
-
-c1.metric("Forecast 2026", f"₹{forecast_df.iloc[0,1]:,}")
-c2.metric("Forecast 2027", f"₹{forecast_df.iloc[1,1]:,}")
-
-st.subheader("📈 Historical + Forecast Trend")
-
-plot_df = pd.concat([
-    yearly.rename(columns={"revenue": "value"}).assign(type="Actual"),
-    forecast_df.rename(columns={"Predicted Revenue (INR)": "value"}).assign(type="Forecast")
-])
-
-st.line_chart(plot_df.set_index("order_year" if "order_year" in plot_df else "Year")["value"])
\ No newline at end of file
+path = forecasts.forecast_file(db.data_version())
+if not os.path.exists(path):
+    st.warning(
+        "No forecasts for the current data yet. load_data.py fits them after "
+        "every build; run `python forecasts.py` to fit them now."
+    )
+    diagnostics.sidebar()
+    st.stop()
+df = load_forecasts(path, os.path.getmtime(path))
+
+# 2️⃣ Pick a series: total revenue or one product category
+names = list(dict.fromkeys(df["series"]))
+series = df[df["series"] == st.selectbox("Series", names)]
+predicted = series[series["kind"] == "Forecast"]
+
+# 3️⃣ Yearly totals for every calendar year the horizon fully covers
+yearly = predicted.groupby(predicted["month"].dt.year)["revenue"].agg(["sum", "size"])
+yearly = yearly[yearly["size"] == 12]["sum"]
+
+columns = st.columns(len(yearly) + 1)
+for column, (year, revenue) in zip(columns, yearly.items()):
+    column.metric(f"Forecast {year}", f"₹{revenue:,.0f}")
+columns[-1].metric(
+    "Monthly fit error (RMSE)", f"₹{predicted['rmse'].iloc[0]:,.0f}",
+    help="Root mean squared error of the model's in-sample monthly fit"
+)
+
+# 4️⃣ UI
+st.subheader("📈 Monthly Revenue: Actual + Forecast")
+st.line_chart(series.pivot(index="month", columns="kind", values="revenue"))
+
+diagnostics.sidebar()
\ No newline at end of file
@@ -1,7 +1,17 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
+
 import streamlit as st
-import sqlite3
 import pandas as pd
 
+import db
+import diagnostics
+import disk_cache
+import result_cache
+import sql_queries
+import transaction_browser
+from query_layer import aggregate, column_values
+
 # -----------------------
 # PAGE CONFIG
 # -----------------------
@@ -13,28 +23,13 @@ st.set_page_config(
 st.title("🛒 Amazon India – E-Commerce Analytics Dashboard")
 st.caption("Optimized BI Dashboard | SQL-first | Scalable")
 
-DB_PATH = "amazon_india.db"
-
-# -----------------------
-# DATABASE CONNECTION
-# -----------------------
-def get_connection():
-    return sqlite3.connect(DB_PATH)
-
 # -----------------------
 # LOAD FILTER VALUES
 # -----------------------
-@st.cache_data
-def get_years():
-    conn = get_connection()
-    years = pd.read_sql(
-        "SELECT DISTINCT order_year FROM transactions ORDER BY order_year",
-        conn
-    )["order_year"].tolist()
-    conn.close()
-    return years
+def get_values(column):
+    return column_values(column)["value"].tolist()
 
-years = get_years()
+years = get_values("order_year")
 
 # -----------------------
 # SIDEBAR FILTERS
@@ -47,146 +42,126 @@ selected_years = st.sidebar.multiselect(
     default=years
 )
 
-year_filter_sql = ",".join(map(str, selected_years))
+selected_cities = st.sidebar.multiselect("City", get_values("customer_city"))
+selected_states = st.sidebar.multiselect("State", get_values("customer_state"))
+selected_payments = st.sidebar.multiselect("Payment Method", get_values("payment_method"))
+selected_prime = st.sidebar.multiselect(
+    "Membership",
+    get_values("is_prime_member"),
+    format_func=lambda v: "Prime" if v else "Non-Prime"
+)
+
+# Empty selections mean "no filter"; query_layer sorts the values and binds
+# them as parameters, so any selection reuses the same query shape
+filters = {
+    "order_year": selected_years,
+    "customer_city": selected_cities,
+    "customer_state": selected_states,
+    "payment_method": selected_payments,
+    "is_prime_member": selected_prime,
+}
+
+exact_customers = st.sidebar.checkbox(
+    "Exact customer count",
+    help="Active customers are a HyperLogLog estimate (~0.8% standard error) by default"
+)
 
 # -----------------------
-# KPI QUERIES (SQL AGGREGATION)
+# PANEL QUERIES (SQL AGGREGATION)
 # -----------------------
-@st.cache_data
-def load_kpis(years_sql):
-    conn = get_connection()
-    query = f"""
-        SELECT
-            SUM(final_amount_inr) AS revenue,
-            COUNT(*) AS orders,
-            COUNT(DISTINCT customer_id) AS customers,
-            AVG(final_amount_inr) AS aov
-        FROM transactions
-        WHERE order_year IN ({years_sql})
-    """
-    df = pd.read_sql(query, conn)
-    conn.close()
-    return df.iloc[0]
+# Each panel's query is independent, so they run concurrently on a shared,
+# bounded thread pool. Worker threads only fetch data; every st.* call stays
+# on the script thread, which fills each panel as its result arrives.
+PANEL_WORKERS = min(6, db.POOL_SIZE)
 
-kpi = load_kpis(year_filter_sql)
+@st.cache_resource
+def panel_pool():
+    return ThreadPoolExecutor(max_workers=PANEL_WORKERS, thread_name_prefix="panel")
 
-# -----------------------
-# KPI DISPLAY
-# -----------------------
-c1, c2, c3, c4 = st.columns(4)
+def load_kpis(where, exact=False):
+    totals = aggregate(**sql_queries.sales_totals(), where=where)
+    customers = aggregate(**sql_queries.active_customers(exact), where=where)
+    return pd.concat([totals, customers], axis=1).iloc[0]
 
-c1.metric("💰 Total Revenue", f"₹{kpi.revenue:,.0f}")
-c2.metric("📦 Total Orders", f"{int(kpi.orders):,}")
-c3.metric("👥 Active Customers", f"{int(kpi.customers):,}")
-c4.metric("🛍 Avg Order Value", f"₹{kpi.aov:,.0f}")
+def revenue_trend(where):
+    return aggregate(**sql_queries.revenue_by_year(), where=where)
 
-st.divider()
+def top_cities(where):
+    return aggregate(**sql_queries.top_cities(10), where=where)
+
+def payment_distribution(where):
+    return aggregate(**sql_queries.payment_distribution(), where=where)
+
+def prime_analysis(where):
+    return aggregate(**sql_queries.prime_analysis(), where=where)
 
 # -----------------------
-# REVENUE TREND (FAST)
+# PANEL LAYOUT
 # -----------------------
-@st.cache_data
-def revenue_trend(years_sql):
-    conn = get_connection()
-    query = f"""
-        SELECT order_year,
-               SUM(final_amount_inr) AS revenue
-        FROM transactions
-        WHERE order_year IN ({years_sql})
-        GROUP BY order_year
-        ORDER BY order_year
-    """
-    df = pd.read_sql(query, conn)
-    conn.close()
-    return df
+kpi_slot = st.empty()
+
+st.divider()
 
 st.subheader("📈 Revenue Trend (Yearly)")
-rev_df = revenue_trend(year_filter_sql)
-st.line_chart(rev_df, x="order_year", y="revenue")
-
-# -----------------------
-# TOP CITIES
-# -----------------------
-@st.cache_data
-def top_cities(years_sql):
-    conn = get_connection()
-    query = f"""
-        SELECT customer_city,
-               SUM(final_amount_inr) AS revenue
-        FROM transactions
-        WHERE order_year IN ({years_sql})
-        GROUP BY customer_city
-        ORDER BY revenue DESC
-        LIMIT 10
-    """
-    df = pd.read_sql(query, conn)
-    conn.close()
-    return df
+trend_slot = st.empty()
 
 st.subheader("🏙 Top 10 Customer Cities")
-st.bar_chart(top_cities(year_filter_sql), x="customer_city", y="revenue")
-
-# -----------------------
-# PAYMENT METHODS
-# -----------------------
-@st.cache_data
-def payment_distribution(years_sql):
-    conn = get_connection()
-    query = f"""
-        SELECT payment_method,
-               COUNT(*) AS orders
-        FROM transactions
-        WHERE order_year IN ({years_sql})
-        GROUP BY payment_method
-        ORDER BY orders DESC
-    """
-    df = pd.read_sql(query, conn)
-    conn.close()
-    return df
+cities_slot = st.empty()
 
 st.subheader("💳 Payment Method Usage")
-st.bar_chart(payment_distribution(year_filter_sql), x="payment_method", y="orders")
-
-# -----------------------
-# PRIME VS NON-PRIME
-# -----------------------
-@st.cache_data
-def prime_analysis(years_sql):
-    conn = get_connection()
-    query = f"""
-        SELECT
-            is_prime_member,
-            AVG(final_amount_inr) AS avg_order_value,
-            COUNT(*) AS orders
-        FROM transactions
-        WHERE order_year IN ({years_sql})
-        GROUP BY is_prime_member
-    """
-    df = pd.read_sql(query, conn)
-    conn.close()
-    return df
+payment_slot = st.empty()
 
 st.subheader("⭐ Prime vs Non-Prime Customers")
-st.dataframe(prime_analysis(year_filter_sql))
-
-# -----------------------
-# SAMPLE DATA (LIMITED)
-# -----------------------
-@st.cache_data
-def sample_data(years_sql):
-    conn = get_connection()
-    query = f"""
-        SELECT *
-        FROM transactions
-        WHERE order_year IN ({years_sql})
-        LIMIT 1000
-    """
-    df = pd.read_sql(query, conn)
-    conn.close()
-    return df
-
-with st.expander("📄 View Sample Transactions (1000 rows)"):
-    st.dataframe(sample_data(year_filter_sql))
+prime_slot = st.empty()
+
+with st.expander("📄 Browse Transactions"):
+    browser_slot = st.container()
+
+# -----------------------
+# PANEL RENDERING
+# -----------------------
+def fmt(value, template):
+    """Format a KPI; filters that match no rows leave it NULL."""
+    return "—" if pd.isna(value) else template.format(value)
+
+def show_kpis(kpi):
+    c1, c2, c3, c4 = kpi_slot.container().columns(4)
+    c1.metric("💰 Total Revenue", fmt(kpi.revenue, "₹{:,.0f}"))
+    c2.metric("📦 Total Orders", fmt(kpi.orders, "{:,.0f}"))
+    c3.metric("👥 Active Customers", fmt(kpi.customers, "{:,.0f}"))
+    c4.metric("🛍 Avg Order Value", fmt(kpi.aov, "₹{:,.0f}"))
+
+panels = {
+    partial(load_kpis, exact=exact_customers): show_kpis,
+    revenue_trend: lambda df: trend_slot.line_chart(df, x="order_year", y="revenue"),
+    top_cities: lambda df: cities_slot.bar_chart(df, x="customer_city", y="revenue"),
+    payment_distribution: lambda df: payment_slot.bar_chart(df, x="payment_method", y="orders"),
+    prime_analysis: lambda df: prime_slot.dataframe(df),
+}
+
+pool = panel_pool()
+pending = {pool.submit(query, filters): render for query, render in panels.items()}
+for future in as_completed(pending):
+    pending[future](future.result())
+
+# The browser pages on its own and reruns as a fragment, outside the pool
+with browser_slot:
+    transaction_browser.show(filters)
+
+# -----------------------
+# CACHE STATISTICS
+# -----------------------
+cache = result_cache.stats()
+st.sidebar.caption(
+    f"🗄 Result cache: {cache['hits']:,} hits · {cache['misses']:,} misses · "
+    f"{cache['bytes'] / 1e6:,.1f} MB"
+)
+disk = disk_cache.stats()
+st.sidebar.caption(
+    f"💾 Disk cache: {disk['entries']:,} results · {disk['hits']:,} hits · "
+    f"{disk['bytes'] / 1e6:,.1f} MB"
+)
+diagnostics.sidebar()
 
 # -----------------------
 # FOOTER
@@ -0,0 +1,55 @@
+import argparse
+import statistics
+import time
+
+import pandas as pd
+
+import query_layer
+import sql_queries
+
+# -----------------------
+# SQLITE VS DUCKDB BENCHMARK
+# -----------------------
+# Runs every dashboard aggregate against both backends, once answered from
+# sales_cube and once scanning transactions, and reports median latency.
+# Run from the directory holding amazon_india.db and data/cleaned/.
+
+
+def time_query(sql, params, backend, repeat):
+    query_layer.execute(sql, params, backend)  # warm-up: file cache, views
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        query_layer.execute(sql, params, backend)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare SQLite and DuckDB on the dashboard queries")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    results, seen = [], set()
+    for name, spec in sql_queries.dashboard_specs().items():
+        for use_cube in (True, False):
+            sql, params = query_layer.aggregate_sql(**spec, use_cube=use_cube)
+            if sql in seen:
+                # Specs the cube cannot answer yield the same SQL both times
+                continue
+            seen.add(sql)
+
+            sqlite_ms = time_query(sql, params, "sqlite", args.repeat)
+            duckdb_ms = time_query(sql, params, "duckdb", args.repeat)
+            results.append({
+                "query": name,
+                "source": "sales_cube" if "FROM sales_cube" in sql else "transactions",
+                "sqlite_ms": round(sqlite_ms, 2),
+                "duckdb_ms": round(duckdb_ms, 2),
+                "speedup": round(sqlite_ms / duckdb_ms, 2),
+            })
+
+    print(pd.DataFrame(results).to_string(index=False))
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,238 @@
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+import bench_cleaning
+import db
+import forecasts
+import generate_data
+import index_advisor
+import query_layer
+from cohorts import read_cohorts
+from customer_rfm import read_rfm
+from feature_engineering import rfm_features
+from kpi import executive_kpis
+from load_data import CLEAN_PATH, DB_PATH, FORECAST_PATH
+
+# -----------------------
+# END-TO-END BENCHMARK SUITE
+# -----------------------
+# Times the whole pipeline: data generation, a full and a no-op
+# load_data.py run, the forecast fits, each data_cleaning function,
+# rfm_features, executive_kpis and every dashboard query on SQLite (and on
+# DuckDB when installed). Results are written as JSON, so two commits can be compared:
+#
+#     python bench_suite.py --rows 1M --output bench_results/main.json
+#     python bench_suite.py --skip-load --compare bench_results/main.json
+#
+# Without --rows the raw files already in data/raw are used.
+
+LOAD_DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "load_data.py")
+
+# A result this much slower than the baseline is reported as a regression
+REGRESSION = 1.2
+
+
+def record(results, group, name, seconds, rows=None):
+    entry = {"group": group, "name": name, "seconds": round(seconds, 6)}
+    if rows:
+        entry["rows"] = int(rows)
+        entry["rows_per_sec"] = round(rows / seconds) if seconds else None
+    results.append(entry)
+    print(f"⏱ {group:<14} {name:<55} {seconds * 1000:>12,.1f} ms")
+
+
+def best_of(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+# -----------------------
+# STAGES
+# -----------------------
+def bench_generate(results, rows, seed, workers):
+    start = time.perf_counter()
+    written = generate_data.generate(rows, seed, workers=workers)
+    record(results, "generate", "generate_data", time.perf_counter() - start, sum(written.values()))
+
+
+def bench_load(results, workers):
+    for name, extra in (("load_data --full", ["--full"]), ("load_data (no changes)", [])):
+        command = [
+            sys.executable, "-W", "ignore", LOAD_DATA, "--workers", str(workers),
+            "--skip-forecasts", *extra,
+        ]
+        start = time.perf_counter()
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL)
+        record(results, "load", name, time.perf_counter() - start, loaded_rows() if extra else None)
+
+    start = time.perf_counter()
+    forecasts.train_all(DB_PATH, FORECAST_PATH, workers)
+    record(results, "load", "forecasts.train_all", time.perf_counter() - start)
+
+
+def bench_cleaning_functions(results, rows, repeat):
+    df = bench_cleaning.messy_columns(rows)
+    for name, column, _, func in bench_cleaning.CASES:
+        _, seconds = bench_cleaning.best_of(func, df[column], repeat)
+        record(results, "cleaning", name, seconds, rows)
+
+
+def bench_analytics(results, rows, repeat):
+    conn = db.connect_readonly(DB_PATH)
+    df = pd.read_sql(
+        "SELECT transaction_id, customer_id, order_date, final_amount_inr, is_prime_member "
+        "FROM transactions LIMIT ?",
+        conn, params=[rows], parse_dates=["order_date"],
+    )
+    record(results, "analytics", "rfm_features", best_of(lambda: rfm_features(df), repeat), len(df))
+    record(results, "analytics", "customer_rfm.read_rfm", best_of(lambda: read_rfm(conn), repeat))
+    record(results, "analytics", "cohorts.read_cohorts", best_of(lambda: read_cohorts(conn), repeat))
+    conn.close()
+    record(results, "analytics", "executive_kpis", best_of(lambda: executive_kpis(df), repeat), len(df))
+
+
+def bench_queries(results, repeat):
+    conn = db.connect_readonly(DB_PATH)
+    for name, variant, _, _, sql, params in index_advisor.collect_queries(conn):
+        seconds = index_advisor.time_sql(conn, sql, params, repeat) / 1000
+        record(results, "query:sqlite", f"{name} [{variant}]", seconds)
+
+    try:
+        import duckdb  # noqa: F401
+    except ImportError:
+        print("⚠ duckdb not installed – skipping DuckDB query timings")
+        return
+    query_layer.PARQUET_PATH = CLEAN_PATH
+    for name, variant, _, _, sql, params in index_advisor.collect_queries(conn, backend="duckdb"):
+        seconds = best_of(lambda: query_layer.execute(sql, params, "duckdb"), repeat)
+        record(results, "query:duckdb", f"{name} [{variant}]", seconds)
+    conn.close()
+
+
+def loaded_rows():
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        return conn.execute("SELECT SUM(row_count) FROM build_manifest").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def table_bytes():
+    """On-disk bytes per table, its indexes included, or {} without dbstat."""
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        return dict(conn.execute("""
+            SELECT m.tbl_name, SUM(s.pgsize)
+            FROM dbstat s JOIN sqlite_master m ON m.name = s.name
+            GROUP BY m.tbl_name
+            ORDER BY 2 DESC
+        """))
+    except sqlite3.OperationalError:
+        return {}
+    finally:
+        conn.close()
+
+
+# -----------------------
+# REPORT
+# -----------------------
+def environment():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+            cwd=os.path.dirname(LOAD_DATA),
+        ).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def compare(results, meta, baseline_path):
+    with open(baseline_path) as f:
+        old_run = json.load(f)
+    if old_run["meta"].get("rows") != meta["rows"]:
+        print(f"⚠ Baseline was run on {old_run['meta'].get('rows')} rows, this run on {meta['rows']}")
+    if old_run["meta"].get("db_bytes"):
+        print(f"💽 Database: {old_run['meta']['db_bytes'] / 1e6:,.1f} MB -> {meta['db_bytes'] / 1e6:,.1f} MB")
+    baseline = {(r["group"], r["name"]): r["seconds"] for r in old_run["results"]}
+    rows = []
+    for r in results:
+        old = baseline.get((r["group"], r["name"]))
+        if old:
+            ratio = r["seconds"] / old
+            rows.append({
+                "group": r["group"], "name": r["name"],
+                "baseline_ms": round(old * 1000, 2), "ms": round(r["seconds"] * 1000, 2),
+                "ratio": round(ratio, 2), "": "⚠ slower" if ratio > REGRESSION else "",
+            })
+    report = pd.DataFrame(rows)
+    print(f"\n📊 Compared with {baseline_path}")
+    print(report.to_string(index=False) if len(report) else "no matching results")
+    return int((report["ratio"] > REGRESSION).sum()) if len(report) else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the pipeline end to end and save JSON results")
+    parser.add_argument("--rows", type=generate_data.parse_rows, default=None,
+                        help="generate this many rows first, e.g. 1M, 10M, 100M")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--skip-load", action="store_true", help="reuse the existing database")
+    parser.add_argument("--cleaning-rows", type=generate_data.parse_rows, default=1_000_000)
+    parser.add_argument("--analytics-rows", type=generate_data.parse_rows, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default=None, help="JSON file (default bench_results/<time>.json)")
+    parser.add_argument("--compare", default=None, help="baseline JSON to compare against")
+    args = parser.parse_args(argv)
+
+    results = []
+    if args.rows:
+        bench_generate(results, args.rows, args.seed, args.workers)
+    if not args.skip_load:
+        bench_load(results, args.workers)
+    bench_cleaning_functions(results, args.cleaning_rows, args.repeat)
+    bench_analytics(results, args.analytics_rows, args.repeat)
+    bench_queries(results, args.repeat)
+
+    meta = environment()
+    meta.update(
+        rows=loaded_rows(), seed=args.seed, repeat=args.repeat,
+        db_bytes=os.path.getsize(DB_PATH), table_bytes=table_bytes(),
+    )
+    output = args.output or os.path.join(
+        "bench_results", f"{meta['timestamp'].replace(':', '')}_{meta['commit'] or 'local'}.json"
+    )
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({"meta": meta, "results": results}, f, indent=2)
+    print(f"\n✅ {len(results)} timings saved to {output}")
+
+    if args.compare and compare(results, meta, args.compare):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
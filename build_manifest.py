@@ -0,0 +1,137 @@
+import hashlib
+import json
+import os
+import sqlite3
+from datetime import datetime
+
+# Stdlib only: a no-op rebuild is decided here before pandas is imported.
+
+MANIFEST_DDL = """
+    CREATE TABLE IF NOT EXISTS build_manifest (
+        order_year INTEGER PRIMARY KEY,
+        file_name TEXT,
+        file_size INTEGER,
+        file_mtime REAL,
+        content_hash TEXT,
+        row_count INTEGER,
+        loaded_at TEXT
+    )
+"""
+
+
+def file_hash(file_path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def fingerprint(file_path, content_hash=None):
+    stat = os.stat(file_path)
+    return {
+        "file_name": os.path.basename(file_path),
+        "file_size": stat.st_size,
+        "file_mtime": stat.st_mtime,
+        "content_hash": content_hash or file_hash(file_path),
+    }
+
+
+def read_manifest(conn):
+    conn.execute(MANIFEST_DDL)
+    rows = conn.execute(
+        "SELECT order_year, file_name, file_size, file_mtime, content_hash FROM build_manifest"
+    ).fetchall()
+    return {
+        year: {"file_name": name, "file_size": size, "file_mtime": mtime, "content_hash": digest}
+        for year, name, size, mtime, digest in rows
+    }
+
+
+def plan_changes(conn, files):
+    """
+    Compare the yearly files on disk with the manifest.
+
+    Returns (changed, removed, touched): `changed` maps year -> file path for
+    years that must be re-ingested, `removed` lists years whose file is gone,
+    and `touched` maps year -> fingerprint for files whose mtime moved but
+    whose content hash did not. Files with an unchanged size and mtime are
+    not hashed, so a no-op plan only costs one stat() per file.
+    """
+    manifest = read_manifest(conn)
+    changed, touched = {}, {}
+
+    for year, file_path in files.items():
+        entry = manifest.get(year)
+        stat = os.stat(file_path)
+        if entry and entry["file_size"] == stat.st_size and entry["file_mtime"] == stat.st_mtime:
+            continue
+
+        current = fingerprint(file_path)
+        if entry and entry["content_hash"] == current["content_hash"]:
+            touched[year] = current
+        else:
+            changed[year] = file_path
+
+    removed = sorted(set(manifest) - set(files))
+    return changed, removed, touched
+
+
+def record(conn, year, fp, row_count=None):
+    conn.execute(MANIFEST_DDL)
+    if row_count is None:
+        conn.execute(
+            "UPDATE build_manifest SET file_size = ?, file_mtime = ? WHERE order_year = ?",
+            (fp["file_size"], fp["file_mtime"], year),
+        )
+        return
+    conn.execute(
+        "INSERT OR REPLACE INTO build_manifest VALUES (?, ?, ?, ?, ?, ?, ?)",
+        (
+            year, fp["file_name"], fp["file_size"], fp["file_mtime"],
+            fp["content_hash"], row_count, datetime.now().isoformat(timespec="seconds"),
+        ),
+    )
+
+
+def forget(conn, year):
+    conn.execute("DELETE FROM build_manifest WHERE order_year = ?", (year,))
+
+
+# -----------------------
+# PRODUCTS CATALOGUE
+# -----------------------
+# The catalogue is not a year partition, so its fingerprint is kept in
+# build_info instead of build_manifest.
+PRODUCTS_KEY = "products_fingerprint"
+
+
+def products_changed(conn, file_path):
+    """
+    (changed, fingerprint) for the products catalogue, compared like a
+    yearly file. A catalogue that appeared or disappeared counts as changed;
+    the fingerprint is None when the file is missing.
+    """
+    try:
+        row = conn.execute("SELECT value FROM build_info WHERE key = ?", (PRODUCTS_KEY,)).fetchone()
+    except sqlite3.OperationalError:
+        row = None
+    entry = json.loads(row[0]) if row else None
+    if not os.path.exists(file_path):
+        return entry is not None, None
+
+    stat = os.stat(file_path)
+    if entry and entry["file_size"] == stat.st_size and entry["file_mtime"] == stat.st_mtime:
+        return False, entry
+    current = fingerprint(file_path)
+    return not entry or entry["content_hash"] != current["content_hash"], current
+
+
+def record_products(conn, fp):
+    if fp is None:
+        conn.execute("DELETE FROM build_info WHERE key = ?", (PRODUCTS_KEY,))
+    else:
+        conn.execute(
+            "INSERT OR REPLACE INTO build_info (key, value) VALUES (?, ?)",
+            (PRODUCTS_KEY, json.dumps(fp)),
+        )
\ No newline at end of file
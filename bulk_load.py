@@ -0,0 +1,105 @@
+import os
+import time
+
+import pandas as pd
+
+SCHEMA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "schema.sql")
+
+# Build-time settings: a full rebuild starts from empty tables, so durability
+# is traded for speed. A crash mid-build is recovered by rerunning --full.
+BUILD_PRAGMAS = {
+    "journal_mode": "OFF",
+    "synchronous": "OFF",
+    "cache_size": -512000,  # KiB, i.e. ~500 MB of page cache
+    "temp_store": "MEMORY",
+}
+
+
+def apply_pragmas(conn, pragmas=BUILD_PRAGMAS):
+    for name, value in pragmas.items():
+        conn.execute(f"PRAGMA {name} = {value}")
+
+
+# -----------------------
+# SCHEMA
+# -----------------------
+def schema_statements(path=SCHEMA_PATH):
+    """Split schema.sql into (table statements, index statements)."""
+    with open(path) as f:
+        statements = [s.strip() for s in f.read().split(";") if s.strip()]
+    tables = [s for s in statements if not s.upper().startswith("CREATE INDEX")]
+    indexes = [s for s in statements if s.upper().startswith("CREATE INDEX")]
+    return tables, indexes
+
+
+def create_tables(conn):
+    for statement in schema_statements()[0]:
+        conn.execute(statement)
+
+
+def create_indexes(conn):
+    """Build the schema indexes and refresh planner statistics."""
+    start = time.perf_counter()
+    for statement in schema_statements()[1]:
+        conn.execute(statement)
+    conn.execute("ANALYZE")
+    return time.perf_counter() - start
+
+
+def table_columns(conn, table):
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+
+
+# -----------------------
+# BULK INSERT
+# -----------------------
+def to_rows(df, columns):
+    """Convert frame columns into tuples sqlite3 can bind (NaN/NaT -> NULL)."""
+    df = df[columns].copy()
+    for col in columns:
+        if pd.api.types.is_datetime64_any_dtype(df[col]):
+            df[col] = df[col].dt.strftime("%Y-%m-%d")
+    df = df.astype(object).where(df.notna(), None)
+    return df.itertuples(index=False, name=None)
+
+
+def bulk_insert(conn, table, df):
+    """
+    executemany the frame into a schema.sql table and return how many rows
+    were stored.
+
+    Only columns the table defines are written; extra raw columns are
+    dropped. A row whose primary key is already stored is skipped, so the
+    first copy wins.
+    """
+    columns = [c for c in table_columns(conn, table) if c in df.columns]
+    sql = (
+        f"INSERT OR IGNORE INTO {table} ({', '.join(columns)}) "
+        f"VALUES ({', '.join('?' * len(columns))})"
+    )
+    before = conn.total_changes
+    conn.executemany(sql, to_rows(df, columns))
+    return conn.total_changes - before
+
+
+def read_since(conn, table, rowid):
+    """Rows stored after `rowid`, with dates and booleans typed as they were inserted."""
+    df = pd.read_sql(f"SELECT * FROM {table} WHERE rowid > ? ORDER BY rowid", conn, params=[rowid])
+    for _, name, decl, *_ in conn.execute(f"PRAGMA table_info({table})"):
+        if decl.upper() == "DATE":
+            df[name] = pd.to_datetime(df[name])
+        elif decl.upper() == "BOOLEAN":
+            # SQLite hands booleans back as 0/1 integers
+            df[name] = df[name].astype("boolean")
+    return df
+
+
+def insert_new(conn, table, df):
+    """
+    bulk_insert, returning the rows actually stored: df itself, or, when
+    some rows were skipped, the stored ones read back from the table.
+    """
+    last = conn.execute(f"SELECT MAX(rowid) FROM {table}").fetchone()[0] or 0
+    if bulk_insert(conn, table, df) == len(df):
+        return df
+    return read_since(conn, table, last)
\ No newline at end of file
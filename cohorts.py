@@ -0,0 +1,119 @@
+import numpy as np
+import pandas as pd
+
+# -----------------------
+# CUSTOMER COHORTS
+# -----------------------
+# Each customer belongs to the cohort of their first order month. For every
+# cohort and number of months since that first order, customer_cohorts holds
+# how many of its customers ordered, their revenue and their orders.
+#
+# SQLite reduces transactions to one row per (customer, order month), sorted
+# by customer. Those rows are streamed in chunks. Because a customer's rows
+# are contiguous, np.minimum.reduceat finds each first month without a
+# groupby, and np.bincount over flat (cohort, age) cell numbers adds up the
+# matrices. The rows of the last customer in a chunk are carried into the
+# next chunk, so nobody is split. The table is rebuilt on every load, because
+# new data can move a customer's first month.
+
+CHUNK_ROWS = 500_000
+
+ACTIVITY_SQL = """
+    SELECT customer_id,
+           CAST(substr(order_date, 1, 4) AS INTEGER) * 12
+               + CAST(substr(order_date, 6, 2) AS INTEGER) - 1 AS month,
+           TOTAL(final_amount_inr) AS revenue,
+           COUNT(*) AS orders
+    FROM transactions
+    WHERE customer_id IS NOT NULL AND order_date IS NOT NULL
+    GROUP BY customer_id, month
+    ORDER BY customer_id
+"""
+
+COHORTS_SQL = """
+    SELECT cohort_month, months_since, customers, revenue, orders
+    FROM customer_cohorts
+"""
+
+
+def month_label(month):
+    return f"{month // 12:04d}-{month % 12 + 1:02d}"
+
+
+class CohortMatrix:
+    """Running cohort x months-since-first-order sums over base..base+span-1."""
+
+    def __init__(self, base, span):
+        self.base, self.span = base, span
+        self.customers = np.zeros(span * span, dtype=np.int64)
+        self.revenue = np.zeros(span * span)
+        self.orders = np.zeros(span * span, dtype=np.int64)
+
+    def add(self, customer, month, revenue, orders):
+        """Add activity rows holding every row of each customer they mention."""
+        if not len(customer):
+            return
+        starts = np.flatnonzero(np.r_[True, customer[1:] != customer[:-1]])
+        first = np.minimum.reduceat(month, starts)
+        cohort = np.repeat(first, np.diff(np.r_[starts, len(customer)]))
+        cell = (cohort - self.base) * self.span + (month - cohort)
+        self.customers += np.bincount(cell, minlength=self.customers.size)
+        self.revenue += np.bincount(cell, weights=revenue, minlength=self.revenue.size)
+        self.orders += np.bincount(cell, weights=orders, minlength=self.orders.size).astype(np.int64)
+
+    def frame(self):
+        """Non-empty cells as customer_cohorts rows."""
+        cells = np.flatnonzero(self.customers)
+        cohort, age = np.divmod(cells, self.span)
+        return pd.DataFrame({
+            "cohort_month": [month_label(self.base + c) for c in cohort],
+            "months_since": age,
+            "customers": self.customers[cells],
+            "revenue": self.revenue[cells],
+            "orders": self.orders[cells],
+        })
+
+
+def build_cohorts(conn, chunk_rows=CHUNK_ROWS):
+    """Rebuild customer_cohorts from transactions."""
+    conn.execute("DELETE FROM customer_cohorts")
+    low, high = conn.execute(
+        "SELECT MIN(order_date), MAX(order_date) FROM transactions"
+    ).fetchone()
+    if low is None:
+        return
+    base, last = (int(d[:4]) * 12 + int(d[5:7]) - 1 for d in (low, high))
+    matrix = CohortMatrix(base, last - base + 1)
+
+    fields = ("customer_id", "month", "revenue", "orders")
+    carry = None
+    for chunk in pd.read_sql(ACTIVITY_SQL, conn, chunksize=chunk_rows):
+        if carry is not None:
+            chunk = pd.concat([carry, chunk], ignore_index=True)
+        arrays = [chunk[c].to_numpy() for c in fields]
+        # The last customer may continue in the next chunk
+        cut = np.searchsorted(arrays[0], arrays[0][-1])
+        carry = chunk.iloc[cut:]
+        matrix.add(*(a[:cut] for a in arrays))
+    if carry is not None:
+        matrix.add(*(carry[c].to_numpy() for c in fields))
+
+    rows = matrix.frame()
+    conn.executemany(
+        "INSERT INTO customer_cohorts (cohort_month, months_since, customers, revenue, orders) "
+        "VALUES (?, ?, ?, ?, ?)",
+        rows.astype(object).itertuples(index=False, name=None),
+    )
+
+
+def matrices(df):
+    """(retention %, revenue) matrices from customer_cohorts rows: one row per
+    cohort month, one column per month since the first order."""
+    customers = df.pivot(index="cohort_month", columns="months_since", values="customers")
+    retention = customers.div(customers[0], axis=0) * 100
+    revenue = df.pivot(index="cohort_month", columns="months_since", values="revenue")
+    return retention, revenue
+
+
+def read_cohorts(conn):
+    return matrices(pd.read_sql(COHORTS_SQL, conn))
\ No newline at end of file
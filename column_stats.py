@@ -0,0 +1,49 @@
+from summary_cube import CUBE_DIMENSIONS
+
+# -----------------------
+# COLUMN STATISTICS CATALOGUE
+# -----------------------
+# column_stats holds min, max, null count, distinct count and row count for
+# every filterable transactions column. column_top_values holds its most
+# frequent values and their row counts. Both are rolled up from sales_cube,
+# whose dimensions are exactly the filterable columns, so the catalogue
+# costs no extra scan of transactions. Dictionary-encoded columns are
+# stored as labels. Filter widgets read values from here, and query_layer
+# uses the stats to drop filters that select everything.
+
+STATS_COLUMNS = CUBE_DIMENSIONS
+TOP_N = 100
+
+
+def build_stats(conn):
+    """Rebuild the catalogue from sales_cube (run after build_cube)."""
+    # dimensions imports pandas; load_data's no-op rebuild imports this module
+    from dimensions import DIMENSIONS
+
+    conn.execute("DELETE FROM column_stats")
+    conn.execute("DELETE FROM column_top_values")
+    for column in STATS_COLUMNS:
+        source, value = "sales_cube c", f"c.{column}"
+        if column in DIMENSIONS:
+            source += f" LEFT JOIN {DIMENSIONS[column]} d ON d.code = c.{column}"
+            value = "d.label"
+        conn.execute(f"""
+            INSERT INTO column_stats
+                (column_name, min_value, max_value, null_count, distinct_count, row_count)
+            SELECT ?,
+                   MIN({value}),
+                   MAX({value}),
+                   COALESCE(SUM(CASE WHEN {value} IS NULL THEN c.orders END), 0),
+                   COUNT(DISTINCT {value}),
+                   COALESCE(SUM(c.orders), 0)
+            FROM {source}
+        """, [column])
+        conn.execute(f"""
+            INSERT INTO column_top_values (column_name, value, frequency)
+            SELECT ?, {value}, SUM(c.orders)
+            FROM {source}
+            WHERE {value} IS NOT NULL
+            GROUP BY {value}
+            ORDER BY SUM(c.orders) DESC
+            LIMIT {TOP_N}
+        """, [column])
\ No newline at end of file
@@ -0,0 +1,72 @@
+import pandas as pd
+
+# -----------------------
+# CUSTOMER RFM TABLE
+# -----------------------
+# customer_rfm_yearly holds each customer's last order date, order count and
+# spend per order year. It is rebuilt per year partition at load time, like
+# sales_cube. customer_rfm rolls those partials up to one row per customer.
+# On an incremental load, only the customers in temp.touched_customers are
+# rolled up again. Recency depends on the latest order in the whole table,
+# so it is computed when reading rather than stored.
+
+
+def build_rfm(conn, years=None):
+    """(Re)build RFM partials for the given order years and re-roll the
+    customers they touch, or rebuild everything when years is None."""
+    where, params = "WHERE customer_id IS NOT NULL", []
+    if years is None:
+        conn.execute("DELETE FROM customer_rfm_yearly")
+    else:
+        years = sorted(years)
+        if not years:
+            return
+        marks = ",".join("?" * len(years))
+        conn.execute(f"DELETE FROM customer_rfm_yearly WHERE order_year IN ({marks})", years)
+        where, params = f"{where} AND order_year IN ({marks})", years
+
+    conn.execute(f"""
+        INSERT INTO customer_rfm_yearly
+            (customer_id, order_year, last_order_date, frequency, monetary)
+        SELECT customer_id,
+               order_year,
+               MAX(order_date),
+               COUNT(transaction_id),
+               TOTAL(final_amount_inr)
+        FROM transactions
+        {where}
+        GROUP BY customer_id, order_year
+    """, params)
+
+    # A NULL customer ID would become its own group and primary key
+    touched = "WHERE customer_id IS NOT NULL"
+    if years is None:
+        conn.execute("DELETE FROM customer_rfm")
+    else:
+        touched += " AND customer_id IN (SELECT customer_id FROM temp.touched_customers)"
+        conn.execute(f"DELETE FROM customer_rfm {touched}")
+    conn.execute(f"""
+        INSERT INTO customer_rfm (customer_id, last_order_date, frequency, monetary)
+        SELECT customer_id, MAX(last_order_date), SUM(frequency), SUM(monetary)
+        FROM customer_rfm_yearly
+        {touched}
+        GROUP BY customer_id
+    """)
+
+
+def read_rfm(conn):
+    """
+    Recency, Frequency and Monetary per customer, as
+    feature_engineering.rfm_features returns them, indexed by customer ID
+    label. Recency counts days up to the day after the latest order.
+    """
+    return pd.read_sql("""
+        SELECT d.label AS customer_id,
+               CAST(julianday((SELECT MAX(last_order_date) FROM customer_rfm)) + 1
+                    - julianday(r.last_order_date) AS INTEGER) AS Recency,
+               r.frequency AS Frequency,
+               r.monetary AS Monetary
+        FROM customer_rfm r
+        JOIN dim_customer d ON d.code = r.customer_id
+        ORDER BY d.label
+    """, conn, index_col="customer_id")
\ No newline at end of file
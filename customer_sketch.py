@@ -0,0 +1,110 @@
+import math
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+# -----------------------
+# HYPERLOGLOG CUSTOMER SKETCHES
+# -----------------------
+# customer_sketches holds one HyperLogLog sketch of customer IDs per
+# (order_year, order_month). Sketches merge by taking the register-wise
+# maximum, so distinct customers over any set of months and years is
+# estimated from a few KB of registers instead of COUNT(DISTINCT) over
+# transactions. Sketches hash the customer ID label from dim_customer, not
+# its integer code, because codes follow first appearance and differ
+# between builds of the same data.
+#
+# With PRECISION = 14 (16,384 one-byte registers) the relative standard error
+# is 1.04 / sqrt(16384) ~ 0.81%: about 68% of estimates fall within 0.81% of
+# the exact count and 99.7% within 2.4%. Small counts use linear counting and
+# are near-exact.
+
+PRECISION = 14
+REGISTERS = 1 << PRECISION
+STANDARD_ERROR = 1.04 / math.sqrt(REGISTERS)
+
+_ALPHA = 0.7213 / (1 + 1.079 / REGISTERS)
+_RANK_BITS = 64 - PRECISION
+
+
+def sketch(ids):
+    """HyperLogLog registers (uint8 array) for an iterable of IDs."""
+    registers = np.zeros(REGISTERS, dtype=np.uint8)
+    ids = pd.Series(ids, dtype=object).dropna().astype(str).unique()
+    if len(ids) == 0:
+        return registers
+
+    # Stable 64-bit hash (fixed hash key) of the labels, so sketches from
+    # different builds merge
+    hashes = pd.util.hash_array(np.asarray(ids, dtype=object))
+    index = (hashes >> np.uint64(_RANK_BITS)).astype(np.intp)
+    rest = hashes & np.uint64((1 << _RANK_BITS) - 1)
+    # rank = leading zeros in the remaining bits + 1; frexp gives the exact
+    # bit length of values below 2**53
+    _, bit_length = np.frexp(rest.astype(np.float64))
+    rank = np.where(rest == 0, _RANK_BITS + 1, _RANK_BITS - bit_length + 1)
+    np.maximum.at(registers, index, rank.astype(np.uint8))
+    return registers
+
+
+def merge(sketches):
+    merged = np.zeros(REGISTERS, dtype=np.uint8)
+    for registers in sketches:
+        np.maximum(merged, registers, out=merged)
+    return merged
+
+
+def estimate(registers):
+    """Approximate distinct count of a (merged) sketch."""
+    raw = _ALPHA * REGISTERS ** 2 / np.sum(np.exp2(-registers.astype(np.float64)))
+    zeros = int(np.count_nonzero(registers == 0))
+    if raw <= 2.5 * REGISTERS and zeros:
+        # Linear counting is more accurate for small cardinalities
+        return REGISTERS * math.log(REGISTERS / zeros)
+    return raw
+
+
+# -----------------------
+# LOAD-TIME BUILD
+# -----------------------
+def build_sketches(conn, years=None):
+    """(Re)build sketches for the given order years, or all of them when None."""
+    if years is None:
+        conn.execute("DELETE FROM customer_sketches")
+        years = [row[0] for row in conn.execute("SELECT DISTINCT order_year FROM transactions")]
+    else:
+        years = sorted(years)
+        if not years:
+            return
+        marks = ",".join("?" * len(years))
+        conn.execute(f"DELETE FROM customer_sketches WHERE order_year IN ({marks})", years)
+
+    for year in years:
+        df = pd.read_sql(
+            "SELECT t.order_month, d.label AS customer_id "
+            "FROM transactions t JOIN dim_customer d ON d.code = t.customer_id "
+            "WHERE t.order_year = ?",
+            conn, params=[year],
+        )
+        conn.executemany(
+            "INSERT INTO customer_sketches (order_year, order_month, registers) VALUES (?, ?, ?)",
+            [
+                (year, None if pd.isna(month) else int(month), sketch(group["customer_id"]).tobytes())
+                for month, group in df.groupby("order_month", dropna=False)
+            ],
+        )
+
+
+def read_sketches(conn):
+    """{(order_year, order_month): registers}, or None when the table is missing."""
+    try:
+        rows = conn.execute(
+            "SELECT order_year, order_month, registers FROM customer_sketches"
+        ).fetchall()
+    except sqlite3.OperationalError:
+        return None
+    return {
+        (year, month): np.frombuffer(registers, dtype=np.uint8)
+        for year, month, registers in rows
+    }
\ No newline at end of file
@@ -1,51 +1,74 @@
 import pandas as pd
-import numpy as np
-import re
 
 def clean_dates(df):
-    df['order_date'] = pd.to_datetime(df['order_date'], errors='coerce', dayfirst=True)
+    dates = pd.to_datetime(df['order_date'], errors='coerce', dayfirst=True)
+    if isinstance(dates.dtype, pd.CategoricalDtype):
+        # A category column read by dtype_plan can come back still categorical
+        dates = dates.astype(dates.cat.categories.dtype)
+    df['order_date'] = dates
     df['order_year'] = df['order_date'].dt.year
     df['order_month'] = df['order_date'].dt.month
     return df
 
+def _map_uniques(series, func):
+    """Run `func` once per distinct value and broadcast back by factorized code."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # Read as category: the categories are the distinct values already
+        codes, uniques = series.cat.codes.to_numpy(), series.cat.categories
+    else:
+        codes, uniques = pd.factorize(series)
+    mapped = func(pd.Series(uniques))
+    return pd.Series(
+        mapped.array.take(codes, allow_fill=True), index=series.index, name=series.name
+    )
+
 def clean_price(series):
+    if pd.api.types.is_numeric_dtype(series):
+        return pd.to_numeric(series, errors='coerce')
     series = series.astype(str)
-    series = series.replace(['Price on Request','nan'], np.nan)
-    series = series.str.replace(r'[₹,]', '', regex=True)
+    series = series.str.replace('₹', '', regex=False).str.replace(',', '', regex=False)
+    # 'Price on Request' and 'nan' fail to parse and are coerced to NaN
     return pd.to_numeric(series, errors='coerce')
 
+def _parse_ratings(values):
+    text = values.astype(str)
+    before_slash = text.str.split('/').str[0]
+    first_number = text.str.extract(r'(\d+\.?\d*)', expand=False)
+    rating = before_slash.where(text.str.contains('/', regex=False), first_number)
+    return pd.to_numeric(rating, errors='coerce').astype(float)
+
 def clean_ratings(series):
-    def parse(x):
-        if pd.isna(x): return np.nan
-        x = str(x)
-        if '/' in x:
-            return float(x.split('/')[0])
-        return float(re.findall(r'\d+\.?\d*', x)[0])
-    return series.apply(parse)
+    return _map_uniques(series, _parse_ratings)
+
+BOOLEAN_MAP = {
+    'Yes':True,'No':False,'Y':True,'N':False,
+    1:True,0:False,True:True,False:False
+}
 
 def clean_boolean(series):
-    return series.map({
-        'Yes':True,'No':False,'Y':True,'N':False,
-        1:True,0:False,True:True,False:False
-    })
+    return _map_uniques(series, lambda values: values.map(BOOLEAN_MAP))
+
+def _parse_delivery(values):
+    return pd.to_numeric(values.replace({'Same Day':0,'1-2 days':2}), errors='coerce')
 
 def clean_delivery(series):
-    series = series.replace({'Same Day':0,'1-2 days':2})
-    series = pd.to_numeric(series, errors='coerce')
+    series = _map_uniques(series, _parse_delivery)
     return series[(series>=0)&(series<=15)]
 
+PAYMENT_MAP = {
+    'UPI':'UPI','PHONEPE':'UPI','GOOGLEPAY':'UPI',
+    'COD':'Cash on Delivery','C.O.D':'Cash on Delivery',
+    'CC':'Credit Card','CREDIT_CARD':'Credit Card'
+}
+
 def clean_payment(series):
-    mapping = {
-        'UPI':'UPI','PHONEPE':'UPI','GOOGLEPAY':'UPI',
-        'COD':'Cash on Delivery','C.O.D':'Cash on Delivery',
-        'CC':'Credit Card','CREDIT_CARD':'Credit Card'
-    }
-    return series.str.upper().replace(mapping)
+    return _map_uniques(series, lambda values: values.str.upper().replace(PAYMENT_MAP))
+
+# Columns that identify a repeated order
+DUPLICATE_KEY = ['customer_id','product_id','order_date','final_amount_inr']
 
 def remove_duplicates(df):
-    return df.drop_duplicates(
-        subset=['customer_id','product_id','order_date','final_amount_inr']
-    )
+    return df.drop_duplicates(subset=DUPLICATE_KEY)
 
 def clean_all(df):
     df = clean_dates(df)
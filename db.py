@@ -0,0 +1,94 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from urllib.parse import quote
+
+# -----------------------
+# SHARED READ-ONLY CONNECTION POOL
+# -----------------------
+# Every dashboard entry point reads through this pool. Connections are
+# opened read-only (mode=ro, query_only) with memory-mapped I/O and a large
+# page cache, and are reused across Streamlit reruns and sessions.
+#
+# load_data.py keeps the database in WAL mode and publishes each full rebuild
+# as a new versioned file that DB_PATH links to, so readers never block a build
+# and a build never blocks readers. Connections open the file the link points
+# at, and the pool notices a new one (new inode) and retires the old ones.
+
+DB_PATH = os.environ.get("AMAZON_INDIA_DB", "amazon_india.db")
+
+POOL_SIZE = int(os.environ.get("AMAZON_INDIA_POOL_SIZE", "8"))
+
+READ_PRAGMAS = {
+    "mmap_size": 1 << 30,    # map up to 1 GiB of the file instead of read() calls
+    "cache_size": -262144,   # KiB, i.e. 256 MB of page cache per connection
+    "temp_store": "MEMORY",
+    "query_only": "ON",
+}
+
+_idle = []
+_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(POOL_SIZE)
+_file_id = None
+
+
+def file_id(path=DB_PATH):
+    stat = os.stat(path)
+    return stat.st_dev, stat.st_ino
+
+
+def connect_readonly(path=DB_PATH):
+    # Resolve the link once, so a connection stays on one published version
+    uri = f"file:{quote(os.path.realpath(path))}?mode=ro"
+    # Pooled connections move between Streamlit script threads, one at a time
+    conn = sqlite3.connect(uri, uri=True, check_same_thread=False, cached_statements=256)
+    for name, value in READ_PRAGMAS.items():
+        conn.execute(f"PRAGMA {name} = {value}")
+    return conn
+
+
+def _checkout():
+    global _file_id
+    current = file_id()
+    with _lock:
+        if current != _file_id:
+            # The database file was replaced by a full rebuild
+            for conn, _ in _idle:
+                conn.close()
+            _idle.clear()
+            _file_id = current
+        if _idle:
+            return _idle.pop()
+    return connect_readonly(), current
+
+
+def _checkin(conn, opened_on):
+    with _lock:
+        if opened_on == _file_id and len(_idle) < POOL_SIZE:
+            _idle.append((conn, opened_on))
+            return
+    conn.close()
+
+
+@contextmanager
+def connection():
+    """Borrow a pooled read-only connection; at most POOL_SIZE are in use at once."""
+    with _slots:
+        conn, opened_on = _checkout()
+        try:
+            yield conn
+        finally:
+            _checkin(conn, opened_on)
+
+
+def data_version():
+    """The token load_data.py writes on every build; None for pre-versioning files."""
+    with connection() as conn:
+        try:
+            row = conn.execute(
+                "SELECT value FROM build_info WHERE key = 'data_version'"
+            ).fetchone()
+        except sqlite3.OperationalError:
+            return None
+    return row[0] if row else None
\ No newline at end of file
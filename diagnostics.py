@@ -0,0 +1,48 @@
+import os
+
+import streamlit as st
+
+import query_log
+
+# -----------------------
+# QUERY DIAGNOSTICS PANEL
+# -----------------------
+# Hidden unless the page is opened with ?diagnostics=1 or the server runs
+# with AMAZON_INDIA_DIAGNOSTICS=1. Timings are per Streamlit process and
+# cover every session it serves.
+
+
+def enabled():
+    return (
+        os.environ.get("AMAZON_INDIA_DIAGNOSTICS") == "1"
+        or st.query_params.get("diagnostics") == "1"
+    )
+
+
+def sidebar():
+    if not enabled():
+        return
+    with st.sidebar.expander("🩺 Query diagnostics", expanded=True):
+        report = query_log.summary()
+        if report.empty:
+            st.caption("No queries recorded yet")
+            return
+        calls = report["calls"].sum()
+        hits = (report["hit_rate"] * report["calls"]).sum()
+        st.caption(
+            f"{len(report)} queries · {calls:,} calls · {hits / calls:.0%} cache hits · "
+            f"slow log: {query_log.SLOW_LOG} (≥ {query_log.SLOW_MS:g} ms)"
+        )
+        st.dataframe(
+            report[["fingerprint", "sql", "calls", "hit_rate", "p50_ms", "p95_ms", "max_ms"]],
+            hide_index=True,
+            column_config={
+                "hit_rate": st.column_config.NumberColumn("hit rate", format="percent"),
+                "p50_ms": st.column_config.NumberColumn("p50 ms", format="%.1f"),
+                "p95_ms": st.column_config.NumberColumn("p95 ms", format="%.1f"),
+                "max_ms": st.column_config.NumberColumn("max ms", format="%.1f"),
+            },
+        )
+        if st.button("Reset timings"):
+            query_log.clear()
+            st.rerun()
\ No newline at end of file
@@ -0,0 +1,89 @@
+import json
+
+import pandas as pd
+
+# -----------------------
+# DICTIONARY-ENCODED DIMENSIONS
+# -----------------------
+# Repeated text columns are stored as integer codes. Each has a dimension
+# table (code INTEGER PRIMARY KEY, label TEXT UNIQUE), and transactions,
+# products, customers, sales_cube and the RFM tables hold the code under the
+# original column name. Queries therefore keep their SQL text. They filter,
+# join and group on compact integers, and query_layer swaps codes for labels
+# only in the final result rows. Codes are never reused, so they stay stable
+# across incremental loads. The Parquet store holds the same codes. Codes
+# follow first appearance, so ORDER BY a dimension column does not sort
+# alphabetically.
+
+DIMENSIONS = {
+    "customer_id": "dim_customer",
+    "product_id": "dim_product",
+    "customer_city": "dim_city",
+    "customer_state": "dim_state",
+    "payment_method": "dim_payment",
+}
+
+
+class Encoder:
+    """Label-to-code maps for one build, seeded from the dimension tables."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.codes = {
+            column: dict(conn.execute(f"SELECT label, code FROM {table}"))
+            for column, table in DIMENSIONS.items()
+        }
+
+    def encode(self, df):
+        """Replace labels by codes in every dimension column of df, adding new labels."""
+        encoded = {}
+        for column, table in DIMENSIONS.items():
+            if column not in df.columns:
+                continue
+            codes = self.codes[column]
+            new = [label for label in pd.unique(df[column].dropna()) if label not in codes]
+            if new:
+                start = max(codes.values(), default=0) + 1
+                added = dict(zip(new, range(start, start + len(new))))
+                self.conn.executemany(
+                    f"INSERT INTO {table} (code, label) VALUES (?, ?)",
+                    [(code, label) for label, code in added.items()],
+                )
+                codes.update(added)
+            encoded[column] = df[column].map(codes).astype("Int64")
+        return df.assign(**encoded)
+
+
+# -----------------------
+# QUERY-TIME TRANSLATION
+# -----------------------
+def lookup_sql(column, by):
+    """SQL mapping a JSON array of labels (by="label") or codes (by="code")."""
+    return (
+        f"SELECT code, label FROM {DIMENSIONS[column]} "
+        f"WHERE {by} IN (SELECT value FROM json_each(?))"
+    )
+
+
+def codes_for(column, labels, run_query):
+    """{label: code} for the given labels (unknown ones left out), or None for a
+    database built before dictionary encoding."""
+    try:
+        df = run_query(lookup_sql(column, "label"), [json.dumps(sorted(labels))], backend="sqlite")
+    except pd.errors.DatabaseError:
+        return None
+    return dict(zip(df["label"], df["code"].astype(int)))
+
+
+def decode(df, run_query):
+    """Swap codes for labels in any dimension column of a result frame."""
+    for column in DIMENSIONS:
+        # Text here means a database built before dictionary encoding
+        if column not in df.columns or not pd.api.types.is_numeric_dtype(df[column]):
+            continue
+        if df[column].isna().all():
+            continue
+        codes = sorted(int(c) for c in df[column].dropna().unique())
+        labels = run_query(lookup_sql(column, "code"), [json.dumps(codes)], backend="sqlite")
+        df[column] = df[column].map(dict(zip(labels["code"], labels["label"])))
+    return df
\ No newline at end of file
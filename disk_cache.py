@@ -0,0 +1,148 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from io import BytesIO
+
+import pandas as pd
+import pyarrow as pa
+
+# -----------------------
+# PERSISTENT QUERY CACHE
+# -----------------------
+# A second cache tier behind result_cache: results are stored as Parquet
+# blobs in a local SQLite file, so every Streamlit process on the host and
+# every restart shares warm results. Keys cover the backend, whitespace-
+# normalized SQL, parameters and data_version; entries from older data
+# versions are purged by the first write each connection makes under a new
+# version, and the file is kept under a size budget by evicting the least
+# recently used results.
+
+PATH = os.environ.get("AMAZON_INDIA_DISK_CACHE", "query_cache.db")
+BUDGET_BYTES = int(os.environ.get("AMAZON_INDIA_DISK_CACHE_MB", "1024")) * 1024 * 1024
+
+DDL = """
+    CREATE TABLE IF NOT EXISTS results (
+        key TEXT PRIMARY KEY,
+        data_version TEXT,
+        sql TEXT,
+        params TEXT,
+        payload BLOB,
+        size INTEGER,
+        created_at REAL,
+        last_used REAL,
+        hits INTEGER DEFAULT 0
+    )
+"""
+
+_local = threading.local()
+
+
+def _conn():
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(PATH, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute(DDL)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_results_last_used ON results(last_used)")
+        _local.conn = conn
+    return conn
+
+
+def normalize_sql(sql):
+    return " ".join(sql.split())
+
+
+def cache_key(backend, sql, params, version):
+    payload = json.dumps([backend, normalize_sql(sql), list(params), version], default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def get(key):
+    """
+    Cached DataFrame for `key`, or None. A broken cache file is treated as a
+    miss, and an entry whose payload no longer decodes is deleted.
+    """
+    try:
+        conn = _conn()
+        row = conn.execute("SELECT payload FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        try:
+            df = pd.read_parquet(BytesIO(row[0]))
+        except (pa.ArrowException, OSError):
+            conn.execute("DELETE FROM results WHERE key = ?", (key,))
+            return None
+        conn.execute(
+            "UPDATE results SET last_used = ?, hits = hits + 1 WHERE key = ?",
+            (time.time(), key),
+        )
+    except sqlite3.Error:
+        return None
+    return df
+
+
+def put(key, version, sql, params, df):
+    """Store a result. Failures only cost the cache entry, never the query."""
+    buffer = BytesIO()
+    try:
+        df.to_parquet(buffer, index=False)
+    except (ValueError, TypeError, pa.ArrowException):
+        # Columns Parquet cannot encode (e.g. mixed object types) are not cached
+        return
+    payload = buffer.getvalue()
+    if len(payload) > BUDGET_BYTES:
+        return
+
+    now = time.time()
+    conn = None
+    try:
+        conn = _conn()
+        conn.execute("BEGIN IMMEDIATE")
+        purge = getattr(_local, "version", None) != version
+        if purge:
+            conn.execute("DELETE FROM results WHERE data_version IS NOT ?", (version,))
+        conn.execute(
+            "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0)",
+            (key, version, normalize_sql(sql), json.dumps(list(params), default=str),
+             payload, len(payload), now, now),
+        )
+        evict(conn)
+        conn.execute("COMMIT")
+        if purge:
+            _local.version = version
+    except sqlite3.Error:
+        if conn is not None and conn.in_transaction:
+            conn.execute("ROLLBACK")
+
+
+def evict(conn, budget=BUDGET_BYTES):
+    """Delete least recently used results until the cache fits the budget."""
+    total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+    if total <= budget:
+        return
+    for key, size in conn.execute(
+        "SELECT key, size FROM results ORDER BY last_used"
+    ).fetchall():
+        conn.execute("DELETE FROM results WHERE key = ?", (key,))
+        total -= size
+        if total <= budget:
+            break
+
+
+def stats():
+    """Entry count, bytes and hits; all zero when the cache file cannot be read."""
+    try:
+        entries, size, hits = _conn().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(hits), 0) FROM results"
+        ).fetchone()
+    except sqlite3.Error:
+        entries, size, hits = 0, 0, 0
+    return {"entries": entries, "bytes": size, "hits": hits, "budget_bytes": BUDGET_BYTES}
+
+
+def clear():
+    _conn().execute("DELETE FROM results")
\ No newline at end of file
@@ -0,0 +1,141 @@
+import argparse
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+# -----------------------
+# DTYPE PLANNER
+# -----------------------
+# Picks compact dtypes for the transactions frame.
+#
+# At read time, plan() samples the first SAMPLE_ROWS rows of a raw file and
+# gives read_csv a dtype per column. Low-cardinality text becomes
+# `category`, and whole numbers get the smallest integer type that holds
+# twice the sampled range. Floats keep float64 at read time, because
+# precision cannot be checked on rows that were not sampled.
+#
+# After cleaning, compact() narrows every column it can verify in full:
+# order_year, order_month and delivery_days become int8/int16, True/False
+# columns with gaps become nullable `boolean` instead of object, and floats
+# become float32 when every value round-trips exactly (ratings do, rupee
+# amounts do not). Stored values are therefore unchanged.
+#
+#     python dtype_plan.py data/raw/amazon_india_2020.csv   # per-column memory report
+
+SAMPLE_ROWS = 100_000
+
+# Text columns with at most this many distinct values, and at most this
+# share of distinct values per row, are read as category
+CATEGORY_MAX = 10_000
+CATEGORY_RATIO = 0.2
+
+INT_TYPES = ("int8", "int16", "int32", "int64")
+HEADROOM = 2
+
+
+def _is_text(series):
+    return pd.api.types.is_string_dtype(series) or series.dtype == object
+
+
+def int_dtype(series, headroom=1):
+    """Smallest integer dtype holding `headroom` times the column's range, or None."""
+    values = series.dropna()
+    if len(values) and not (values == values.round()).all():
+        return None
+    low, high = (values.min(), values.max()) if len(values) else (0, 0)
+    for name in INT_TYPES:
+        info = np.iinfo(name)
+        if info.min <= low * headroom and high * headroom <= info.max:
+            # Nullable when the column has gaps
+            return name if series.notna().all() else name.capitalize()
+    return None
+
+
+def is_category(series):
+    distinct = series.nunique()
+    return distinct <= CATEGORY_MAX and distinct <= CATEGORY_RATIO * max(len(series), 1)
+
+
+def plan_column(series):
+    """read_csv dtype for one sampled raw column, or None to let pandas infer."""
+    if pd.api.types.is_integer_dtype(series):
+        return int_dtype(series, HEADROOM)
+    if _is_text(series) and is_category(series):
+        return "category"
+    return None
+
+
+def plan(file_path, sample_rows=SAMPLE_ROWS):
+    """{column: dtype} for reading a raw yearly file with read_csv."""
+    sample = pd.read_csv(file_path, nrows=sample_rows)
+    dtypes = {column: plan_column(sample[column]) for column in sample.columns}
+    return {column: dtype for column, dtype in dtypes.items() if dtype}
+
+
+def compact(df):
+    """Narrow the dtypes of a cleaned frame without changing any value."""
+    narrowed = {}
+    for column in df.columns:
+        series = df[column]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            continue
+        values = series.dropna()
+        if series.dtype == object and len(values) and values.map(type).isin([bool, np.bool_]).all():
+            narrowed[column] = series.astype("boolean")
+        elif pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            dtype = int_dtype(series)
+            if dtype:
+                narrowed[column] = series.astype(dtype)
+            elif pd.api.types.is_float_dtype(series) and series.dtype != np.float32:
+                as_float32 = series.astype(np.float32)
+                if as_float32.astype(np.float64).equals(series.astype(np.float64)):
+                    narrowed[column] = as_float32
+        elif _is_text(series) and is_category(series):
+            narrowed[column] = series.astype("category")
+    return df.assign(**narrowed)
+
+
+# -----------------------
+# MEMORY REPORT
+# -----------------------
+def memory_report(file_path, nrows=None):
+    """
+    Per-column bytes of the cleaned frame, read as inferred vs. as planned.
+    order_year comes from an amazon_india_<year>.csv file name, as in
+    load_data; for any other name it is left out of the report.
+    """
+    from ingest import clean_transactions
+
+    match = re.fullmatch(r"amazon_india_(\d{4})\.csv", os.path.basename(file_path))
+    year = int(match.group(1)) if match else 0
+    before = clean_transactions(pd.read_csv(file_path, nrows=nrows), year)
+    after = compact(clean_transactions(pd.read_csv(file_path, nrows=nrows, dtype=plan(file_path)), year))
+    if not match:
+        before, after = before.drop(columns="order_year"), after.drop(columns="order_year")
+    report = pd.DataFrame({
+        "dtype_before": before.dtypes.astype(str),
+        "bytes_before": before.memory_usage(index=False, deep=True),
+        "dtype_after": after.dtypes.astype(str),
+        "bytes_after": after.memory_usage(index=False, deep=True),
+    })
+    report.loc["TOTAL", ["bytes_before", "bytes_after"]] = report[["bytes_before", "bytes_after"]].sum()
+    report["ratio"] = (report["bytes_before"] / report["bytes_after"]).round(1)
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report planned dtypes and memory per column")
+    parser.add_argument("file", help="a raw yearly CSV file")
+    parser.add_argument("--rows", type=int, default=None, help="read only the first N rows")
+    args = parser.parse_args(argv)
+
+    report = memory_report(args.file, args.rows)
+    print(report.to_string(float_format=lambda v: f"{v:,.0f}"))
+    total = report.loc["TOTAL"]
+    print(f"\n🧮 {total.bytes_before / 1e6:,.1f} MB -> {total.bytes_after / 1e6:,.1f} MB "
+          f"({total.ratio}x smaller)")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -1,22 +1,175 @@
-import matplotlib.pyplot as plt
-import seaborn as sns
-
-def revenue_trend(df):
-    yearly = df.groupby('order_year')['final_amount_inr'].sum()
-    plt.figure(figsize=(10,4))
-    sns.lineplot(x=yearly.index, y=yearly.values)
-    plt.title("Revenue Trend 2015–2025")
-    plt.show()
-
-def payment_trend(df):
-    pivot = df.pivot_table(values='final_amount_inr',
-                           index='order_year',
-                           columns='payment_method',
-                           aggfunc='sum')
-    pivot.plot.area(figsize=(10,5))
-    plt.show()
-
-def category_performance(df):
-    cat = df.groupby('category')['final_amount_inr'].sum().sort_values()
-    cat.plot(kind='barh', figsize=(8,6))
-    plt.show()
\ No newline at end of file
+import argparse
+import hashlib
+import html
+import inspect
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+import sql_queries
+from query_layer import aggregate
+
+# -----------------------
+# HEADLESS EDA REPORT
+# -----------------------
+# Each chart reads a small aggregate through query_layer, so the sales cube
+# answers it, and never loads raw rows. Charts are rendered to PNG with
+# matplotlib's non-interactive Agg backend, in parallel in a process pool,
+# and collected in an index.html. manifest.json stores a fingerprint of each
+# chart's input data and drawing code. A chart whose fingerprint has not
+# changed since the last run is not redrawn.
+#
+#     python eda.py                  # from the directory holding amazon_india.db
+#     python eda.py --force          # redraw every chart
+
+REPORT_PATH = os.path.join("reports", "eda")
+MANIFEST = "manifest.json"
+
+
+# -----------------------
+# CHARTS
+# -----------------------
+# Each function draws one aggregate frame onto a matplotlib Axes
+def revenue_trend(df, ax):
+    import seaborn as sns
+
+    sns.lineplot(data=df, x="order_year", y="revenue", marker="o", ax=ax)
+
+
+def payment_trend(df, ax):
+    df.pivot(index="order_year", columns="payment_method", values="revenue").plot.area(ax=ax)
+
+
+def category_performance(df, ax):
+    df.set_index("category")["revenue"].sort_values().plot.barh(ax=ax)
+
+
+def monthly_revenue(df, ax):
+    df.plot.bar(x="order_month", y="revenue", legend=False, ax=ax)
+
+
+def top_cities(df, ax):
+    df.set_index("customer_city")["revenue"].sort_values().plot.barh(ax=ax)
+
+
+def delivery_distribution(df, ax):
+    df.plot.bar(x="delivery_days", y="orders", legend=False, ax=ax)
+
+
+# name: (aggregate spec, drawing function, title, figure size)
+CHARTS = {
+    "revenue_trend": (
+        sql_queries.revenue_by_year, revenue_trend, "Revenue Trend", (10, 4)
+    ),
+    "payment_trend": (
+        sql_queries.payment_revenue_by_year, payment_trend, "Revenue by Payment Method", (10, 5)
+    ),
+    "category_performance": (
+        sql_queries.top_categories, category_performance, "Revenue by Category", (8, 6)
+    ),
+    "monthly_revenue": (
+        sql_queries.monthly_revenue, monthly_revenue, "Revenue by Month", (10, 4)
+    ),
+    "top_cities": (
+        sql_queries.top_cities, top_cities, "Top 10 Cities by Revenue", (8, 6)
+    ),
+    "delivery_distribution": (
+        sql_queries.delivery_distribution, delivery_distribution, "Orders by Delivery Days", (10, 4)
+    ),
+}
+
+
+# -----------------------
+# RENDERING
+# -----------------------
+def fingerprint(name, df):
+    """Digest of a chart's input data and drawing code."""
+    digest = hashlib.sha1(inspect.getsource(CHARTS[name][1]).encode())
+    digest.update(json.dumps([list(df.columns), [str(t) for t in df.dtypes]]).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def render(name, df, path):
+    """Process-pool worker: draw one chart to a PNG file."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    _, draw, title, size = CHARTS[name]
+    fig, ax = plt.subplots(figsize=size)
+    draw(df, ax)
+    ax.set_title(title)
+    fig.tight_layout()
+    fig.savefig(path, dpi=110)
+    plt.close(fig)
+    return name
+
+
+def write_index(out):
+    sections = "\n".join(
+        f"<h2>{html.escape(title)}</h2>\n<img src=\"{name}.png\" alt=\"{html.escape(title)}\">"
+        for name, (_, _, title, _) in CHARTS.items()
+    )
+    with open(os.path.join(out, "index.html"), "w", encoding="utf-8") as f:
+        f.write(
+            "<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\">"
+            "<title>Amazon India EDA</title></head>\n<body>\n"
+            f"<h1>Amazon India – Exploratory Data Analysis</h1>\n{sections}\n</body></html>\n"
+        )
+
+
+def build_report(out=REPORT_PATH, workers=None, force=False):
+    """Render every chart whose input changed. Returns (rendered, skipped) names."""
+    os.makedirs(out, exist_ok=True)
+    manifest_path = os.path.join(out, MANIFEST)
+    manifest = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+
+    inputs = {name: aggregate(**spec()) for name, (spec, _, _, _) in CHARTS.items()}
+    digests = {name: fingerprint(name, df) for name, df in inputs.items()}
+    stale = [
+        name for name in CHARTS
+        if force
+        or manifest.get(name) != digests[name]
+        or not os.path.exists(os.path.join(out, f"{name}.png"))
+    ]
+
+    if stale:
+        workers = min(workers or os.cpu_count() or 1, len(stale))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(render, name, inputs[name], os.path.join(out, f"{name}.png"))
+                for name in stale
+            ]
+            for future in futures:
+                name = future.result()
+                manifest[name] = digests[name]
+
+    write_index(out)
+    with open(manifest_path, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return stale, [name for name in CHARTS if name not in stale]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render the EDA charts to PNG and HTML")
+    parser.add_argument("--output", default=REPORT_PATH, help="report directory (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: one per CPU)")
+    parser.add_argument("--force", action="store_true", help="redraw charts whose input is unchanged")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    rendered, skipped = build_report(args.output, args.workers, args.force)
+    print(
+        f"🖼 {len(rendered)} charts rendered, {len(skipped)} unchanged, in "
+        f"{time.perf_counter() - start:.2f}s – {os.path.join(args.output, 'index.html')}"
+    )
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
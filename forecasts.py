@@ -0,0 +1,178 @@
+import argparse
+import os
+import shutil
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+import db
+
+# -----------------------
+# REVENUE FORECASTS
+# -----------------------
+# Fits one Holt-Winters model (statsmodels ExponentialSmoothing: additive
+# trend, additive 12-month seasonality) per monthly revenue series: the total
+# and each product category, read from sales_cube. Series are fitted in
+# parallel in a process pool. Fitted models and forecasts are saved under
+# FORECAST_PATH/<data_version>/, where models/index.parquet maps each series
+# to its pickled HoltWintersResults. The dashboard only reads a small Parquet
+# file and never fits anything in a request. load_data.py runs this after
+# every build that changes the data. Older versions are deleted. pandas and
+# statsmodels are imported inside the functions that use them, so checking
+# for a version's forecasts (load_data's no-op rebuild) stays cheap.
+#
+#     python forecasts.py            # from the directory holding amazon_india.db
+
+FORECAST_PATH = os.path.join("data", "forecasts")
+HORIZON = 24       # months forecast past the last loaded month
+SEASON = 12
+TOTAL = "All categories"
+
+# Revenue per month, in total and per category. The total is its own query
+# because products without a category would drop out of a per-category sum.
+TOTAL_SQL = """
+    SELECT order_year, order_month, SUM(revenue) AS revenue
+    FROM sales_cube
+    WHERE order_month IS NOT NULL
+    GROUP BY order_year, order_month
+"""
+
+CATEGORY_SQL = """
+    SELECT order_year, order_month, category, SUM(revenue) AS revenue
+    FROM sales_cube
+    WHERE order_month IS NOT NULL AND category IS NOT NULL
+    GROUP BY order_year, order_month, category
+"""
+
+
+def version_dir(version, root=FORECAST_PATH):
+    return os.path.join(root, version or "unversioned")
+
+
+def forecast_file(version, root=FORECAST_PATH):
+    return os.path.join(version_dir(version, root), "forecasts.parquet")
+
+
+def _months(df):
+    import pandas as pd
+
+    return pd.PeriodIndex.from_fields(year=df["order_year"], month=df["order_month"], freq="M")
+
+
+def load_series(conn):
+    """{name: monthly revenue Series on a gap-free PeriodIndex}."""
+    import pandas as pd
+
+    total = pd.read_sql(TOTAL_SQL, conn)
+    total.index = _months(total)
+    months = pd.period_range(total.index.min(), total.index.max(), freq="M")
+    series = {TOTAL: total["revenue"].reindex(months, fill_value=0)}
+
+    by_category = pd.read_sql(CATEGORY_SQL, conn)
+    by_category["month"] = _months(by_category)
+    by_category = by_category.pivot(index="month", columns="category", values="revenue")
+    by_category = by_category.reindex(months).fillna(0)
+    series.update({category: by_category[category] for category in by_category.columns})
+    return series
+
+
+def fit_series(name, history, model_path, horizon=HORIZON):
+    """Process-pool worker: fit one series, save the model, return its forecast."""
+    import pandas as pd
+    from statsmodels.tsa.holtwinters import ExponentialSmoothing
+
+    # Seasonality needs two full cycles of history
+    seasonal = "add" if len(history) >= 2 * SEASON else None
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        fit = ExponentialSmoothing(
+            history.to_timestamp(),
+            trend="add",
+            seasonal=seasonal,
+            seasonal_periods=SEASON if seasonal else None,
+        ).fit()
+    fit.save(model_path)
+
+    rmse = float(((history.to_numpy() - fit.fittedvalues.to_numpy()) ** 2).mean() ** 0.5)
+    forecast = fit.forecast(horizon).clip(lower=0)
+    return pd.DataFrame({
+        "series": name,
+        "month": pd.period_range(history.index[-1] + 1, periods=horizon, freq="M").to_timestamp(),
+        "revenue": forecast.to_numpy(),
+        "kind": "Forecast",
+        "rmse": rmse,
+    })
+
+
+def train_all(db_path=db.DB_PATH, root=FORECAST_PATH, workers=None):
+    """Fit every series for the database's current data_version. Returns the output directory."""
+    import pandas as pd
+
+    conn = db.connect_readonly(db_path)
+    try:
+        version = conn.execute(
+            "SELECT value FROM build_info WHERE key = 'data_version'"
+        ).fetchone()
+        version = version[0] if version else None
+        series = load_series(conn)
+    finally:
+        conn.close()
+
+    out = version_dir(version, root)
+    tmp = out + ".tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(os.path.join(tmp, "models"))
+
+    models = {name: f"{i:03d}.pickle" for i, name in enumerate(series)}
+    actuals = [
+        pd.DataFrame({"series": name, "month": history.index.to_timestamp(),
+                      "revenue": history.to_numpy(), "kind": "Actual"})
+        for name, history in series.items()
+    ]
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(fit_series, name, history, os.path.join(tmp, "models", models[name]))
+            for name, history in series.items()
+        ]
+        predicted = [future.result() for future in futures]
+
+    pd.concat(actuals + predicted, ignore_index=True).to_parquet(
+        os.path.join(tmp, "forecasts.parquet"), index=False
+    )
+    pd.DataFrame({"series": list(models), "model": list(models.values())}).to_parquet(
+        os.path.join(tmp, "models", "index.parquet"), index=False
+    )
+
+    # Publish the finished directory in one rename, then drop older versions
+    shutil.rmtree(out, ignore_errors=True)
+    os.replace(tmp, out)
+    for entry in os.listdir(root):
+        if entry != os.path.basename(out):
+            shutil.rmtree(os.path.join(root, entry), ignore_errors=True)
+    return out
+
+
+def load(version, root=FORECAST_PATH):
+    """Actuals and forecasts for a data_version, or None if not trained yet."""
+    import pandas as pd
+
+    path = forecast_file(version, root)
+    if not os.path.exists(path):
+        return None
+    return pd.read_parquet(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fit revenue forecasts for the current data version")
+    parser.add_argument("--db", default=db.DB_PATH, help="database to read (default: %(default)s)")
+    parser.add_argument("--output", default=FORECAST_PATH, help="forecast directory (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: one per CPU)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    out = train_all(args.db, args.output, args.workers)
+    print(f"🔮 Forecasts written to {out} in {time.perf_counter() - start:.2f}s")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,212 @@
+import argparse
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from load_data import RAW_PATH, YEARS
+
+# -----------------------
+# SYNTHETIC DATA GENERATOR
+# -----------------------
+# Writes data/raw/amazon_india_{year}.csv in the raw formats data_cleaning
+# expects: "₹1,234.56" and bare-number prices, "Price on Request", "4/5" and
+# "3.5 stars" ratings, "Same Day" / "1-2 days" delivery, mixed payment and
+# Yes/No/Y/N spellings, plus a sprinkling of duplicate orders. Output is fully
+# determined by --seed and --rows. Files are written in chunks, so 100M rows
+# need no more memory than 1M. Later years get more orders, as a growing
+# marketplace would.
+#
+#     python generate_data.py --rows 10M
+
+CHUNK_ROWS = 1_000_000
+YEARLY_GROWTH = 1.25
+DUPLICATE_RATE = 0.005
+
+PRODUCTS_FILE = "amazon_india_products_catalog.csv"
+BUNDLED_PRODUCTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "products_cleaned.csv")
+
+CITIES = [
+    ("Mumbai", "Maharashtra"), ("Pune", "Maharashtra"), ("Nagpur", "Maharashtra"),
+    ("Delhi", "Delhi"), ("Bengaluru", "Karnataka"), ("Chennai", "Tamil Nadu"),
+    ("Coimbatore", "Tamil Nadu"), ("Hyderabad", "Telangana"), ("Kolkata", "West Bengal"),
+    ("Ahmedabad", "Gujarat"), ("Surat", "Gujarat"), ("Jaipur", "Rajasthan"),
+    ("Lucknow", "Uttar Pradesh"), ("Kochi", "Kerala"), ("Indore", "Madhya Pradesh"),
+    ("Bhopal", "Madhya Pradesh"), ("Chandigarh", "Chandigarh"), ("Patna", "Bihar"),
+    ("Visakhapatnam", "Andhra Pradesh"), ("Guwahati", "Assam"),
+]
+
+# Raw spellings and how often they occur
+PAYMENTS = {
+    "UPI": 0.20, "PhonePe": 0.10, "GooglePay": 0.08, "COD": 0.12, "C.O.D": 0.05,
+    "Credit Card": 0.10, "CC": 0.05, "Credit_Card": 0.05, "Debit Card": 0.15,
+    "Net Banking": 0.07, "Wallet": 0.03,
+}
+DELIVERY = {
+    "Same Day": 0.08, "1-2 days": 0.22, "3": 0.2, "4": 0.15, "5": 0.12, "7": 0.1,
+    "10": 0.06, "20": 0.03, "-1": 0.01, "Express": 0.03,
+}
+RATINGS = {
+    "5/5": 0.15, "4/5": 0.2, "3/5": 0.08, "4.5 stars": 0.1, "3.5 stars": 0.07,
+    "4.0": 0.12, "2.5": 0.05, "1/5": 0.03, None: 0.2,
+}
+BOOLEANS = {"Yes": 0.4, "No": 0.4, "Y": 0.08, "N": 0.08, None: 0.04}
+
+
+def parse_rows(text):
+    """'1M', '10m', '250k' or a plain integer."""
+    text = str(text).strip().lower().replace("_", "")
+    multiplier = {"k": 1_000, "m": 1_000_000}.get(text[-1:], 1)
+    return int(float(text.rstrip("km")) * multiplier)
+
+
+def rows_per_year(total, years):
+    weights = np.array([YEARLY_GROWTH ** i for i in range(len(years))])
+    counts = np.floor(total * weights / weights.sum()).astype(int)
+    counts[-1] += total - counts.sum()
+    return dict(zip(years, counts.tolist()))
+
+
+def pick(rng, choices, size):
+    values = list(choices)
+    probs = np.array(list(choices.values()), dtype=float)
+    index = rng.choice(len(values), size=size, p=probs / probs.sum())
+    return np.array(values, dtype=object)[index]
+
+
+def rupees(amounts, rng, bare_share=0.2):
+    """'₹12,345.67' strings, with a share left as bare numbers."""
+    bare = (rng.random(len(amounts)) < bare_share).tolist()
+    return np.array([
+        str(v) if b else f"₹{v:,.2f}" for v, b in zip(amounts.tolist(), bare)
+    ], dtype=object)
+
+
+# -----------------------
+# GENERATION
+# -----------------------
+def load_products(out_dir):
+    """The product catalogue orders are drawn from, copied into out_dir if missing."""
+    path = os.path.join(out_dir, PRODUCTS_FILE)
+    if not os.path.exists(path):
+        shutil.copyfile(BUNDLED_PRODUCTS, path)
+    products = pd.read_csv(path, usecols=["product_id", "base_price_2015"])
+    return (
+        products["product_id"].to_numpy(dtype=object),
+        pd.to_numeric(products["base_price_2015"], errors="coerce").fillna(999.0).to_numpy(),
+    )
+
+
+@lru_cache(maxsize=1)
+def customer_pool(n_customers, seed):
+    rng = np.random.default_rng([seed, 0])
+    return {
+        "id": np.char.add("CUST_", np.char.zfill(np.arange(n_customers).astype(str), 8)).astype(object),
+        "city": rng.integers(0, len(CITIES), n_customers),
+        "prime": pick(rng, BOOLEANS, n_customers),
+    }
+
+
+def calendar(year):
+    """(dd/mm/yyyy strings, months) for every day of the year, indexed by day of year."""
+    days = pd.date_range(f"{year}-01-01", f"{year}-12-31", freq="D")
+    return days.strftime("%d/%m/%Y").to_numpy(dtype=object), days.month.to_numpy()
+
+
+def make_chunk(rng, year, start, size, products, customers):
+    product_ids, base_prices = products
+    n_customers = len(customers["id"])
+
+    # Skewed towards low IDs, so some customers order far more often
+    customer = (n_customers * rng.random(size) ** 2).astype(int)
+    product = rng.integers(0, len(product_ids), size)
+
+    # Formatting each date is slow; look the day of year up instead
+    day_text, day_month = calendar(year)
+    day = rng.integers(0, len(day_text), size)
+
+    festival = np.isin(day_month[day], [10, 11]) & (rng.random(size) < 0.6)
+    original = base_prices[product] * (1.04 ** (year - 2015)) * rng.uniform(0.9, 1.1, size)
+    discount = np.where(festival, rng.uniform(0.2, 0.5, size), rng.uniform(0.0, 0.25, size))
+    final = (original * (1 - discount)).round(2)
+
+    city = customers["city"][customer]
+    df = pd.DataFrame({
+        "transaction_id": [f"TXN_{year}_{i:09d}" for i in range(start, start + size)],
+        "customer_id": customers["id"][customer],
+        "product_id": product_ids[product],
+        "order_date": day_text[day],
+        "original_price_inr": rupees(original.round(2), rng),
+        "final_amount_inr": rupees(final, rng),
+        "customer_city": np.array([c for c, _ in CITIES], dtype=object)[city],
+        "customer_state": np.array([s for _, s in CITIES], dtype=object)[city],
+        "payment_method": pick(rng, PAYMENTS, size),
+        "delivery_days": pick(rng, DELIVERY, size),
+        "customer_rating": pick(rng, RATINGS, size),
+        "is_prime_member": customers["prime"][customer],
+        "is_festival_sale": np.where(festival, "Yes", "No"),
+    })
+    df.loc[rng.random(size) < 0.01, "original_price_inr"] = "Price on Request"
+
+    # Re-submitted orders: same customer, product, date and amount, new ID
+    dupes = np.flatnonzero(rng.random(size) < DUPLICATE_RATE)
+    dupes = dupes[dupes > 0]
+    cols = ["customer_id", "product_id", "order_date", "final_amount_inr"]
+    df.loc[dupes, cols] = df.loc[dupes - 1, cols].to_numpy()
+    return df
+
+
+def generate_year(year, rows, seed, out_dir, n_customers):
+    """Write one yearly file. Every chunk has its own seeded stream, so output
+    does not depend on how years are spread over workers."""
+    products = load_products(out_dir)
+    pool = customer_pool(n_customers, seed)
+    path = os.path.join(out_dir, f"amazon_india_{year}.csv")
+    for chunk_no, start in enumerate(range(0, max(rows, 1), CHUNK_ROWS)):
+        size = min(CHUNK_ROWS, rows - start)
+        rng = np.random.default_rng([seed, year, chunk_no])
+        chunk = make_chunk(rng, year, start, size, products, pool)
+        chunk.to_csv(path, mode="w" if chunk_no == 0 else "a", header=chunk_no == 0, index=False)
+    return rows
+
+
+def generate(total_rows, seed=42, out_dir=RAW_PATH, years=YEARS, customers=None, workers=1):
+    os.makedirs(out_dir, exist_ok=True)
+    load_products(out_dir)  # copy the catalogue once, before workers read it
+    n_customers = customers or max(total_rows // 10, 100)
+    plan = rows_per_year(total_rows, list(years))
+
+    args = [(year, rows, seed, out_dir, n_customers) for year, rows in plan.items()]
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            counts = list(pool.map(generate_year, *zip(*args)))
+    else:
+        counts = [generate_year(*a) for a in args]
+    return dict(zip(plan, counts))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write seeded synthetic yearly transaction files")
+    parser.add_argument("--rows", type=parse_rows, default=parse_rows("1M"),
+                        help="total rows across all years, e.g. 1M, 10M, 100M")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--customers", type=parse_rows, default=None,
+                        help="customer pool size (default rows / 10)")
+    parser.add_argument("--out", default=RAW_PATH)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="years generated in parallel")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    written = generate(args.rows, args.seed, args.out, customers=args.customers,
+                       workers=args.workers)
+    elapsed = time.perf_counter() - start
+    print(f"✅ {sum(written.values()):,} rows in {len(written)} yearly files written to {args.out}")
+    print(f"⚡ {sum(written.values()) / elapsed:,.0f} rows/sec")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,293 @@
+import argparse
+import re
+import sqlite3
+import statistics
+import time
+
+import pandas as pd
+
+import db
+import query_layer
+import sql_queries
+import transaction_browser
+
+# -----------------------
+# INDEX ADVISOR
+# -----------------------
+# Collects the SQL every dashboard page can issue: each sql_queries spec under
+# the filter combinations the widgets produce, routed exactly as
+# query_layer.aggregate routes it, plus the exact customer count and the
+# first page of the transaction browser in each sort order. It runs EXPLAIN
+# QUERY PLAN on each query and flags full table scans and temp B-trees for
+# grouping or DISTINCT. For each flagged query it proposes a covering index:
+# filter columns first, then grouping columns, then the columns the measures
+# read. Proposals are printed as DDL. --apply creates them, re-runs ANALYZE,
+# drops any the planner does not pick and reports before/after plans and
+# timings.
+# Run from the directory holding amazon_india.db.
+
+# An applied index is kept only if the queries using it get MIN_GAIN faster
+# together and none of them gets slower beyond timing noise
+MIN_GAIN = 0.2
+NOISE = 0.1
+NOISE_MS = 0.5
+
+
+def catalogue_values(conn, column, n):
+    return [row[0] for row in conn.execute(
+        "SELECT value FROM column_top_values WHERE column_name = ? ORDER BY frequency DESC LIMIT ?",
+        (column, n),
+    )]
+
+
+def filter_variants(conn):
+    """The filter combinations the sidebar widgets and sliders produce."""
+    years = sorted(catalogue_values(conn, "order_year", 100))
+    variants = {"unfiltered": {}}
+    if years:
+        variants["single year"] = {"order_year": years[-1]}
+        variants["year range"] = {"order_year": tuple(years[-3:])}
+        variants["year set"] = {"order_year": (years[0], years[-1])}
+        variants["year + city/payment/prime"] = {
+            "order_year": tuple(years[-2:]),
+            "customer_city": catalogue_values(conn, "customer_city", 2),
+            "payment_method": catalogue_values(conn, "payment_method", 1),
+            "is_prime_member": [1],
+        }
+    return variants
+
+
+def dashboard_specs():
+    specs = sql_queries.dashboard_specs()
+    # Sketches answer the default; the sidebar can ask for the exact count
+    specs["active_customers"] = sql_queries.active_customers(exact=True)
+    return specs
+
+
+def collect_queries(conn, backend="sqlite"):
+    """[(name, variant, spec, where, sql, params)] for the database behind conn, without duplicate SQL."""
+    queries, seen = [], set()
+    for variant, where in filter_variants(conn).items():
+        for name, spec in dashboard_specs().items():
+            sql, params = query_layer.aggregate_sql(**spec, where=where, backend=backend, conn=conn)
+            if sql not in seen:
+                seen.add(sql)
+                queries.append((name, variant, spec, where, sql, params))
+
+        # The browser always reads SQLite (rowid and the sort indexes)
+        if backend != "sqlite":
+            continue
+        for sort in transaction_browser.SORT_KEYS.values():
+            sql, params = transaction_browser.page_sql(
+                transaction_browser.DEFAULT_COLUMNS, where, sort, conn=conn
+            )
+            if sql not in seen:
+                seen.add(sql)
+                queries.append((f"browse_transactions by {sort}", variant, {}, where, sql, params))
+    return queries
+
+
+# -----------------------
+# PLANS AND TIMINGS
+# -----------------------
+def explain(conn, sql, params):
+    return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+
+
+def plan_flags(plan):
+    """Full scans without a covering index, and temp B-trees built to group rows.
+
+    Sorting by an aggregate (ORDER BY revenue DESC) always needs a temp
+    B-tree over the already-small result, so those are not flagged.
+    """
+    flags = []
+    for step in plan:
+        if step.startswith("SCAN") and "COVERING INDEX" not in step and "json_each" not in step:
+            flags.append(step)
+        if "TEMP B-TREE" in step and "ORDER BY" not in step:
+            flags.append(step)
+    return flags
+
+
+def time_sql(conn, sql, params, repeat):
+    conn.execute(sql, params).fetchall()  # warm the page cache
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        conn.execute(sql, params).fetchall()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+# -----------------------
+# PROPOSALS
+# -----------------------
+def source_table(sql):
+    return "sales_cube" if "FROM sales_cube" in sql else "transactions"
+
+
+def measure_columns(spec, table):
+    columns = []
+    for func, column in spec.get("measures", {}).values():
+        if table == "sales_cube" and (func, column) in query_layer.CUBE_MEASURES:
+            columns += re.findall(r"\((\w+)\)", query_layer.CUBE_MEASURES[(func, column)])
+        elif column != "*":
+            columns.append(column)
+    return columns
+
+
+def propose(conn, spec, where, sql):
+    """(table, columns) of a covering index for one query, or None."""
+    table = source_table(sql)
+    available = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+    # Equality filters lead, then range/set filters, then grouping and measures
+    filters = sorted(where, key=lambda c: isinstance(where[c], (list, tuple, set)))
+    columns = filters + list(spec.get("group_by", ())) + measure_columns(spec, table)
+    if "JOIN products" in sql:
+        columns.append("product_id")
+    columns = [c for c in dict.fromkeys(columns) if c in available]
+    return (table, tuple(columns)) if columns else None
+
+
+def existing_indexes(conn):
+    indexes = set()
+    for table in ("transactions", "sales_cube"):
+        for _, name, *_ in conn.execute(f"PRAGMA index_list({table})"):
+            columns = tuple(row[2] for row in conn.execute(f"PRAGMA index_info({name})"))
+            indexes.add((table, columns))
+    return indexes
+
+
+def consolidate(proposals, existing):
+    """Drop proposals that are a prefix of another proposal or of an existing index."""
+    covered = set(proposals) | existing
+    kept = []
+    for table, columns in sorted(set(proposals)):
+        if any(
+            other_table == table and len(other) > len(columns) and other[:len(columns)] == columns
+            for other_table, other in covered
+        ) or (table, columns) in existing:
+            continue
+        kept.append((table, columns))
+    return kept
+
+
+def index_name(table, columns):
+    return f"idx_adv_{table}_{'_'.join(columns)}"
+
+
+def index_ddl(table, columns):
+    return f"CREATE INDEX IF NOT EXISTS {index_name(table, columns)} ON {table}({', '.join(columns)})"
+
+
+# -----------------------
+# REPORT
+# -----------------------
+def analyze(conn, queries, repeat):
+    rows = []
+    for name, variant, spec, where, sql, params in queries:
+        plan = explain(conn, sql, params)
+        rows.append({
+            "query": name,
+            "filters": variant,
+            "source": source_table(sql),
+            "flags": "; ".join(plan_flags(plan)) or "-",
+            "ms": round(time_sql(conn, sql, params, repeat), 3),
+            "plan": " ".join(plan),
+        })
+    return rows
+
+
+def unhelpful(proposals, before, trial):
+    """
+    Proposals no query uses, that slow down any query using them, or whose
+    queries together got less than MIN_GAIN faster.
+    """
+    dropped = []
+    for table, columns in proposals:
+        name = index_name(table, columns)
+        users = [i for i, row in enumerate(trial) if name in row["plan"]]
+        old = sum(before[i]["ms"] for i in users)
+        new = sum(trial[i]["ms"] for i in users)
+        regressed = any(
+            trial[i]["ms"] > before[i]["ms"] * (1 + NOISE) + NOISE_MS for i in users
+        )
+        if not users or regressed or new > old * (1 - MIN_GAIN):
+            dropped.append((table, columns))
+    return dropped
+
+
+def run_ddl(path, statements):
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA busy_timeout = 30000")
+    for statement in statements:
+        conn.execute(statement)
+    conn.execute("ANALYZE")
+    conn.commit()
+    conn.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="EXPLAIN the dashboard queries and propose covering indexes")
+    parser.add_argument("--apply", action="store_true", help="create the proposed indexes and re-time")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--db", default=db.DB_PATH)
+    args = parser.parse_args(argv)
+
+    conn = db.connect_readonly(args.db)
+    queries = collect_queries(conn)
+    before = analyze(conn, queries, args.repeat)
+
+    proposals = [
+        propose(conn, spec, where, sql)
+        for (name, variant, spec, where, sql, params), row in zip(queries, before)
+        if row["flags"] != "-"
+    ]
+    proposals = consolidate([p for p in proposals if p], existing_indexes(conn))
+    conn.close()
+
+    report = pd.DataFrame(before)
+    flagged = (report["flags"] != "-").sum()
+    print(f"🔎 {len(queries)} queries explained, {flagged} with full scans or temp B-trees\n")
+
+    if not proposals:
+        print(report.drop(columns="plan").to_string(index=False))
+        print("\n✅ No new indexes proposed")
+        return
+
+    print("💡 Proposed indexes:")
+    for table, columns in proposals:
+        print(f"   {index_ddl(table, columns)};")
+    print()
+
+    if not args.apply:
+        print(report.drop(columns="plan").to_string(index=False))
+        print("\nRe-run with --apply to create them and compare timings")
+        return
+
+    start = time.perf_counter()
+    run_ddl(args.db, [index_ddl(table, columns) for table, columns in proposals])
+    print(f"✅ Indexes created in {time.perf_counter() - start:.2f}s")
+
+    conn = db.connect_readonly(args.db)
+    trial = analyze(conn, queries, args.repeat)
+    conn.close()
+    dropped = unhelpful(proposals, before, trial)
+    if dropped:
+        run_ddl(args.db, [f"DROP INDEX {index_name(table, columns)}" for table, columns in dropped])
+        print(f"🗑 Dropped {len(dropped)} index(es) that went unused or did not speed up their queries")
+    for table, columns in proposals:
+        if (table, columns) not in dropped:
+            print(f"📌 Kept {index_ddl(table, columns)}")
+    print()
+
+    conn = db.connect_readonly(args.db)
+    after = analyze(conn, queries, args.repeat)
+    conn.close()
+    report["flags_after"] = [row["flags"] for row in after]
+    report["ms_after"] = [row["ms"] for row in after]
+    report = report.rename(columns={"ms": "ms_before"}).drop(columns="plan")
+    print(report.to_string(index=False))
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
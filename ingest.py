@@ -0,0 +1,155 @@
+import multiprocessing
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+
+import dtype_plan
+from data_cleaning import clean_all
+
+# Ensure required columns exist
+REQUIRED_COLS = [
+    "transaction_id",
+    "customer_id",
+    "product_id",
+    "order_date",
+    "final_amount_inr",
+    "customer_city",
+    "customer_state",
+    "payment_method",
+    "delivery_days",
+    "is_prime_member",
+    "original_price_inr",
+    "customer_rating",
+    "is_festival_sale"
+]
+
+
+# -----------------------
+# CLEANING
+# -----------------------
+def clean_transactions(df, year):
+    """Run the data_cleaning pipeline on one yearly frame or chunk."""
+    df.columns = df.columns.str.lower().str.strip()
+
+    for col in REQUIRED_COLS:
+        if col not in df.columns:
+            df[col] = None
+
+    df = clean_all(df)
+
+    # The source file, not the parsed order date, decides the year partition
+    df["order_year"] = year
+    return df
+
+
+# -----------------------
+# READERS
+# -----------------------
+def read_raw(file_path, chunk_size=None):
+    """
+    Yield raw frames for one yearly file, read with the dtypes planned by
+    dtype_plan. If a row past the sample does not fit the plan, the rest of
+    the file is read with the dtypes pandas infers.
+    """
+    dtypes = dtype_plan.plan(file_path)
+    if not chunk_size:
+        try:
+            df = pd.read_csv(file_path, dtype=dtypes)
+        except (ValueError, TypeError, OverflowError):
+            df = pd.read_csv(file_path)
+        yield df
+        return
+
+    done = 0
+    with pd.read_csv(file_path, dtype=dtypes, chunksize=chunk_size) as reader:
+        while True:
+            try:
+                chunk = next(reader)
+            except StopIteration:
+                return
+            except (ValueError, TypeError, OverflowError):
+                break
+            done += len(chunk)
+            yield chunk
+    yield from pd.read_csv(file_path, skiprows=range(1, done + 1), chunksize=chunk_size)
+
+
+def read_year(file_path, year, chunk_size=None):
+    """
+    Yield cleaned, dtype-compacted frames for one yearly file.
+
+    Without a chunk size the whole file is read as a single frame; with one,
+    the file is streamed so at most `chunk_size` rows are held at a time.
+    Duplicates are only removed within a chunk here; the transactions
+    table's idx_dedup drops those split by a chunk boundary.
+    """
+    for chunk in read_raw(file_path, chunk_size):
+        yield dtype_plan.compact(clean_transactions(chunk, year))
+
+
+def ingest_year(file_path, year, chunk_size, queue):
+    """
+    Process-pool worker: parse and clean one yearly file, handing each frame
+    (or chunk) to the writer through `queue`, then (year, None) when done.
+    """
+    print(f"📂 Loading {file_path}")
+    try:
+        for frame in read_year(file_path, year, chunk_size):
+            queue.put((year, frame))
+    finally:
+        queue.put((year, None))
+
+
+def ingest_parallel(files, chunk_size=None, workers=2):
+    """
+    Fan the yearly files out to a process pool and yield (year, frame) pairs
+    as workers produce them. The queue holds at most `workers` frames and a
+    worker waits while it is full, so memory is bounded by the chunk size
+    (or by one year per worker without one), however far the single writer
+    falls behind. A year's frames arrive in file order.
+    """
+    with ProcessPoolExecutor(max_workers=workers) as pool, multiprocessing.Manager() as manager:
+        queue = manager.Queue(maxsize=workers)
+        futures = [
+            pool.submit(ingest_year, file_path, year, chunk_size, queue)
+            for year, file_path in files.items()
+        ]
+        try:
+            running = len(futures)
+            while running:
+                year, frame = queue.get()
+                if frame is None:
+                    running -= 1
+                else:
+                    yield year, frame
+            for future in futures:
+                future.result()
+        finally:
+            # Stopped early: drop files not started yet. Shutting the manager
+            # down makes any worker blocked on the queue fail instead of hang.
+            for future in futures:
+                future.cancel()
+
+
+def ingest_serial(files, chunk_size=None):
+    for year, file_path in files.items():
+        print(f"📂 Loading {file_path}")
+        for frame in read_year(file_path, year, chunk_size):
+            yield year, frame
+
+
+def read_products(products_path):
+    products = pd.read_csv(products_path)
+    products.columns = products.columns.str.lower().str.strip()
+    return products
+
+
+# -----------------------
+# DIMENSION BUILDERS
+# -----------------------
+def build_time_dimension(order_dates):
+    time_dim = pd.DataFrame({"date": pd.to_datetime(sorted(order_dates))})
+    time_dim["year"] = time_dim["date"].dt.year
+    time_dim["month"] = time_dim["date"].dt.month
+    time_dim["quarter"] = time_dim["date"].dt.to_period("Q").astype(str)
+    time_dim["day"] = time_dim["date"].dt.day
+    return time_dim
\ No newline at end of file
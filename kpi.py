@@ -1,7 +1,53 @@
+import math
+
 def executive_kpis(df):
     return {
         "Total Revenue": df.final_amount_inr.sum(),
         "Active Customers": df.customer_id.nunique(),
         "AOV": df.final_amount_inr.mean(),
         "Prime %": df.is_prime_member.mean()*100
-    }
\ No newline at end of file
+    }
+
+
+class KpiAccumulator:
+    """
+    The state behind executive_kpis, fed one chunk at a time with update()
+    and combined across workers or years with merge(). result() matches
+    executive_kpis over all rows seen, up to float rounding in the revenue
+    sum. Memory grows with distinct customers, not rows: an exact count
+    needs every id, so the customer set holds small integers when fed
+    dictionary-encoded frames (see dimensions.py), as load_data does.
+    """
+
+    def __init__(self):
+        self.revenue = 0.0
+        self.amount_count = 0
+        self.prime_sum = 0.0
+        self.prime_count = 0
+        self.customers = set()
+
+    def update(self, df):
+        amounts = df.final_amount_inr
+        self.revenue += float(amounts.sum())
+        self.amount_count += int(amounts.count())
+        prime = df.is_prime_member.dropna().astype(float)
+        self.prime_sum += float(prime.sum())
+        self.prime_count += len(prime)
+        self.customers.update(df.customer_id.dropna().unique().tolist())
+        return self
+
+    def merge(self, other):
+        self.revenue += other.revenue
+        self.amount_count += other.amount_count
+        self.prime_sum += other.prime_sum
+        self.prime_count += other.prime_count
+        self.customers |= other.customers
+        return self
+
+    def result(self):
+        return {
+            "Total Revenue": self.revenue,
+            "Active Customers": len(self.customers),
+            "AOV": self.revenue / self.amount_count if self.amount_count else math.nan,
+            "Prime %": self.prime_sum / self.prime_count * 100 if self.prime_count else math.nan
+        }
\ No newline at end of file
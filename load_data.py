@@ -1,6 +1,14 @@
-import pandas as pd
+import argparse
 import sqlite3
 import os
+import time
+import uuid
+from datetime import datetime
+
+import build_manifest
+import column_stats
+import summary_cube
+from kpi import KpiAccumulator
 
 # -----------------------
 # PATH CONFIGURATION
@@ -9,154 +17,449 @@ BASE_DIR = os.path.dirname(os.path.dirname(__file__))
 RAW_PATH = os.path.join(BASE_DIR, "data", "raw")
 CLEAN_PATH = os.path.join(BASE_DIR, "data", "cleaned")
 DB_PATH = os.path.join(BASE_DIR, "amazon_india.db")
+FORECAST_PATH = os.path.join(BASE_DIR, "data", "forecasts")
+PRODUCTS_PATH = os.path.join(RAW_PATH, "amazon_india_products_catalog.csv")
+BUILD_PATH = DB_PATH + ".building"
 
-os.makedirs(CLEAN_PATH, exist_ok=True)
+BUSY_TIMEOUT_MS = 30000
 
-# -----------------------
-# DATABASE CONNECTION
-# -----------------------
-conn = sqlite3.connect(DB_PATH)
-cursor = conn.cursor()
+YEARS = range(2015, 2026)
 
-print("✅ Connected to database:", DB_PATH)
 
-# -----------------------
-# LOAD & MERGE YEARLY FILES
-# -----------------------
-all_years = []
+def year_files():
+    """Return {year: path} for every yearly raw file present in RAW_PATH."""
+    files = {}
+    for year in YEARS:
+        file_path = os.path.join(RAW_PATH, f"amazon_india_{year}.csv")
+        if os.path.exists(file_path):
+            files[year] = file_path
+        else:
+            print(f"⚠ Missing file: amazon_india_{year}.csv")
+    return files
 
-for year in range(2015, 2026):
-    file_path = os.path.join(RAW_PATH, f"amazon_india_{year}.csv")
 
-    if os.path.exists(file_path):
-        print(f"📂 Loading {file_path}")
-        df_year = pd.read_csv(file_path)
-        df_year["order_year"] = year
-        all_years.append(df_year)
-    else:
-        print(f"⚠ Missing file: amazon_india_{year}.csv")
+def train_forecasts(workers):
+    """Fit the revenue forecasts for the database's current data_version."""
+    import forecasts
 
-if not all_years:
-    raise FileNotFoundError("❌ No yearly files found in data/raw/")
+    start = time.perf_counter()
+    forecasts.train_all(DB_PATH, FORECAST_PATH, workers)
+    print(f"✅ Revenue forecasts fitted in {time.perf_counter() - start:.2f}s")
 
-transactions = pd.concat(all_years, ignore_index=True)
-print(f"✅ Total transactions loaded: {len(transactions):,}")
 
-# -----------------------
-# BASIC CLEANING (SAFE)
-# -----------------------
-transactions.columns = transactions.columns.str.lower().str.strip()
-
-# Ensure required columns exist
-required_cols = [
-    "transaction_id",
-    "customer_id",
-    "product_id",
-    "order_date",
-    "final_amount_inr",
-    "customer_city",
-    "customer_state",
-    "payment_method",
-    "delivery_days",
-    "is_prime_member"
-]
-
-for col in required_cols:
-    if col not in transactions.columns:
-        transactions[col] = None
-
-# Convert dates
-transactions["order_date"] = pd.to_datetime(
-    transactions["order_date"], errors="coerce"
-)
-
-# Convert numerics
-transactions["final_amount_inr"] = pd.to_numeric(
-    transactions["final_amount_inr"], errors="coerce"
-)
-
-transactions["delivery_days"] = pd.to_numeric(
-    transactions["delivery_days"], errors="coerce"
-)
-
-# Boolean cleanup
-transactions["is_prime_member"] = transactions["is_prime_member"].astype(str).str.lower().isin(
-    ["true", "1", "yes", "y"]
-)
+def forecasts_current(conn):
+    import forecasts
 
-# -----------------------
-# SAVE CLEANED TRANSACTIONS
-# -----------------------
-transactions.to_csv(
-    os.path.join(CLEAN_PATH, "transactions_cleaned.csv"), index=False
-)
+    row = conn.execute("SELECT value FROM build_info WHERE key = 'data_version'").fetchone()
+    return os.path.isdir(forecasts.version_dir(row and row[0], FORECAST_PATH))
 
-print("✅ transactions_cleaned.csv created")
 
-# -----------------------
-# LOAD PRODUCTS (OPTIONAL)
-# -----------------------
-products_path = os.path.join(RAW_PATH, "amazon_india_products_catalog.csv")
+def table_exists(conn, name, kind="table"):
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = ? AND name = ?", (kind, name)
+    ).fetchone() is not None
 
-if os.path.exists(products_path):
-    products = pd.read_csv(products_path)
-    products.columns = products.columns.str.lower().str.strip()
 
-    products.to_csv(
-        os.path.join(CLEAN_PATH, "products_cleaned.csv"), index=False
+def bump_data_version(conn):
+    """Give this build a new data_version so result caches keyed on it go stale."""
+    version = uuid.uuid4().hex
+    conn.executemany(
+        "INSERT OR REPLACE INTO build_info (key, value) VALUES (?, ?)",
+        [
+            ("data_version", version),
+            ("built_at", datetime.now().isoformat(timespec="seconds")),
+        ],
     )
+    return version
+
+
+def publish(build_path, db_path, version):
+    """
+    Move a finished build to its own versioned file and atomically repoint
+    the db_path symlink at it. SQLite names -wal/-shm after the file a link
+    resolves to, so readers still on the previous version never share them
+    with the new one.
+    """
+    previous = os.path.realpath(db_path) if os.path.exists(db_path) else None
+    target = f"{db_path}.{version}"
+    os.replace(build_path, target)
+    link = db_path + ".link"
+    if os.path.lexists(link):
+        os.remove(link)
+    os.symlink(os.path.basename(target), link)
+    os.replace(link, db_path)
+    prune_versions(db_path, keep={target, previous})
+
+
+def prune_versions(db_path, keep):
+    """
+    Delete published versions other than `keep`, with their -wal/-shm.
+    The previous version is kept until the next build, so pooled readers
+    (db.py) still on it are retired before its files go away.
+    """
+    keep = {os.path.realpath(path) for path in keep if path}
+    folder = os.path.realpath(os.path.dirname(os.path.abspath(db_path)))
+    prefix = os.path.basename(db_path)
+    for name in os.listdir(folder):
+        base = name.removesuffix("-wal").removesuffix("-shm")
+        version = base[len(prefix) + 1:] if base.startswith(prefix + ".") else None
+        published = version is not None and len(version) == 32 and version.isalnum()
+        # A database file from before versioning leaves its -wal/-shm behind
+        legacy = base == prefix and name != prefix
+        if (published or legacy) and os.path.join(folder, base) not in keep:
+            os.remove(os.path.join(folder, name))
 
-    products.to_sql("products", conn, if_exists="replace", index=False)
-    print("✅ Products table created")
-else:
-    print("⚠ products catalog not found – skipping products table")
 
 # -----------------------
-# CREATE CUSTOMERS TABLE
+# DERIVED TABLES
 # -----------------------
-customers = transactions[[
-    "customer_id",
-    "customer_city",
-    "customer_state",
-    "is_prime_member"
-]].drop_duplicates()
+# A customer's city, state and Prime flag are taken from their latest order
+# (ties broken by transaction_id), so full and incremental builds agree.
+CUSTOMERS_SQL = """
+    INSERT INTO customers (customer_id, customer_city, customer_state, is_prime_member)
+    SELECT customer_id, customer_city, customer_state, is_prime_member
+    FROM (
+        SELECT customer_id, customer_city, customer_state, is_prime_member,
+               ROW_NUMBER() OVER (
+                   PARTITION BY customer_id ORDER BY order_date DESC, transaction_id DESC
+               ) AS recency
+        FROM transactions
+        WHERE customer_id IS NOT NULL {touched}
+    )
+    WHERE recency = 1
+"""
+
+
+def build_customers(conn):
+    """Derive the customers table from transactions inside SQLite, not in memory."""
+    conn.execute("DELETE FROM customers")
+    conn.execute(CUSTOMERS_SQL.format(touched=""))
+
+
+def refresh_customers(conn):
+    """Rebuild only the customers listed in temp.touched_customers."""
+    conn.execute("""
+        DELETE FROM customers
+        WHERE customer_id IN (SELECT customer_id FROM temp.touched_customers)
+    """)
+    conn.execute(CUSTOMERS_SQL.format(
+        touched="AND customer_id IN (SELECT customer_id FROM temp.touched_customers)"
+    ))
+
+
+def write_year_kpis(conn, kpis):
+    """Store each loaded year's KPI accumulator state in year_kpis."""
+    conn.executemany(
+        "INSERT OR REPLACE INTO year_kpis "
+        "(order_year, revenue, amount_count, prime_sum, prime_count, active_customers) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        [
+            (year, acc.revenue, acc.amount_count, acc.prime_sum, acc.prime_count, len(acc.customers))
+            for year, acc in kpis.items()
+        ],
+    )
 
-customers.to_sql("customers", conn, if_exists="replace", index=False)
 
-print("✅ Customers table created with columns:", customers.columns.tolist())
+def touch_year(conn, year):
+    """Record the customers and calendar years a year partition covers."""
+    conn.execute(
+        "INSERT OR IGNORE INTO temp.touched_customers "
+        "SELECT DISTINCT customer_id FROM transactions WHERE order_year = ?",
+        (year,),
+    )
+    rows = conn.execute(
+        "SELECT DISTINCT CAST(strftime('%Y', order_date) AS INTEGER) "
+        "FROM transactions WHERE order_year = ? AND order_date IS NOT NULL",
+        (year,),
+    ).fetchall()
+    return {row[0] for row in rows}
+
+
+def refresh_time_dimension(conn, ingest, bulk_load, years=None):
+    """Rebuild time_dimension rows for the given calendar years (all when None)."""
+    query = "SELECT DISTINCT date(order_date) FROM transactions WHERE order_date IS NOT NULL"
+    params = []
+    if years is None:
+        conn.execute("DELETE FROM time_dimension")
+    else:
+        params = sorted(years)
+        if not params:
+            return
+        marks = ",".join("?" * len(params))
+        conn.execute(f"DELETE FROM time_dimension WHERE year IN ({marks})", params)
+        query += f" AND CAST(strftime('%Y', order_date) AS INTEGER) IN ({marks})"
 
-# -----------------------
-# CREATE TIME DIMENSION
-# -----------------------
-time_dim = transactions[["order_date"]].dropna().drop_duplicates()
-time_dim["date"] = time_dim["order_date"]
-time_dim["year"] = time_dim["date"].dt.year
-time_dim["month"] = time_dim["date"].dt.month
-time_dim["quarter"] = time_dim["date"].dt.to_period("Q").astype(str)
-time_dim["day"] = time_dim["date"].dt.day
+    dates = [row[0] for row in conn.execute(query, params)]
+    bulk_load.bulk_insert(conn, "time_dimension", ingest.build_time_dimension(dates))
 
-time_dim = time_dim.drop(columns=["order_date"])
 
-time_dim.to_sql("time_dimension", conn, if_exists="replace", index=False)
+def load_products(conn, ingest, bulk_load, encoder):
+    if os.path.exists(PRODUCTS_PATH):
+        products = ingest.read_products(PRODUCTS_PATH)
 
-print("✅ Time dimension table created")
+        products.to_csv(
+            os.path.join(CLEAN_PATH, "products_cleaned.csv"), index=False
+        )
 
-# -----------------------
-# CREATE TRANSACTIONS TABLE
-# -----------------------
-transactions.to_sql("transactions", conn, if_exists="replace", index=False)
+        conn.execute("DELETE FROM products")
+        bulk_load.bulk_insert(conn, "products", encoder.encode(products))
+        print("✅ Products table created")
+    else:
+        conn.execute("DELETE FROM products")
+        print("⚠ products catalog not found – skipping products table")
 
-print("✅ Transactions table created")
 
 # -----------------------
-# INDEXING FOR PERFORMANCE
+# BUILD
 # -----------------------
-cursor.execute("CREATE INDEX IF NOT EXISTS idx_txn_date ON transactions(order_date)")
-cursor.execute("CREATE INDEX IF NOT EXISTS idx_txn_customer ON transactions(customer_id)")
-cursor.execute("CREATE INDEX IF NOT EXISTS idx_txn_product ON transactions(product_id)")
+def build(chunk_size=None, workers=1, full=False, forecast=True):
+    os.makedirs(CLEAN_PATH, exist_ok=True)
+
+    conn = sqlite3.connect(DB_PATH)
+    conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+    cursor = conn.cursor()
+
+    print("✅ Connected to database:", DB_PATH)
+
+    files = year_files()
+    if not files:
+        raise FileNotFoundError("❌ No yearly files found in data/raw/")
+
+    # -----------------------
+    # PLAN: FULL OR INCREMENTAL
+    # -----------------------
+    # A database from before dictionary encoding or the duplicate-order
+    # index is rebuilt in full
+    incremental = (
+        not full
+        and table_exists(conn, "transactions")
+        and table_exists(conn, "dim_customer")
+        and table_exists(conn, "idx_dedup", kind="index")
+        and bool(build_manifest.read_manifest(conn))
+    )
+
+    if incremental:
+        # Changes go straight into the live file; in WAL mode dashboard
+        # readers keep their snapshot until the single commit at the end.
+        # Neither pragma can change once the manifest updates below open a
+        # transaction.
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        changed, removed, touched = build_manifest.plan_changes(conn, files)
+        for year, fp in touched.items():
+            build_manifest.record(conn, year, fp)
+        products_changed, products_fp = build_manifest.products_changed(conn, PRODUCTS_PATH)
+        # A database from before the statistics catalogue, RFM or cohort tables still gets them
+        if (
+            not changed and not removed and not products_changed
+            and table_exists(conn, "column_stats")
+            and table_exists(conn, "customer_rfm")
+            and table_exists(conn, "customer_cohorts")
+        ):
+            # The catalogue's mtime may have moved without a content change
+            build_manifest.record_products(conn, products_fp)
+            conn.commit()
+            stale = forecast and not forecasts_current(conn)
+            conn.close()
+            print("✅ Database is up to date – nothing to rebuild")
+            if stale:
+                train_forecasts(workers)
+            return
+        print(
+            f"🔁 Incremental rebuild – changed: {sorted(changed) or '-'}, removed: {removed or '-'}"
+            + (", products catalog changed" if products_changed else "")
+        )
+    else:
+        changed, removed = files, []
+        products_changed, products_fp = build_manifest.products_changed(conn, PRODUCTS_PATH)
+
+    # Fingerprint before reading so an edit made mid-build is caught next run
+    fingerprints = {year: build_manifest.fingerprint(path) for year, path in changed.items()}
+
+    # pandas is only needed once there is something to ingest
+    import bulk_load
+    import cohorts
+    import customer_rfm
+    import customer_sketch
+    import dimensions
+    import ingest
+    import parquet_store
+
+    if not incremental:
+        # A full rebuild goes into a side file that is swapped in when done,
+        # so it never waits on dashboard readers. Fresh typed tables come from
+        # schema.sql; indexes are deferred until the data is in, and
+        # durability is off for the duration of the build.
+        conn.close()
+        if os.path.exists(BUILD_PATH):
+            os.remove(BUILD_PATH)
+        conn = sqlite3.connect(BUILD_PATH)
+        cursor = conn.cursor()
+        bulk_load.apply_pragmas(conn)
+    # Databases built before sketches existed get them for every year
+    sketch_all = not incremental or not table_exists(conn, "customer_sketches")
+    rfm_all = not incremental or not table_exists(conn, "customer_rfm")
+    bulk_load.create_tables(conn)
+    encoder = dimensions.Encoder(conn)
+
+    # -----------------------
+    # DROP STALE YEAR PARTITIONS
+    # -----------------------
+    touched_years = set()
+    cursor.execute("CREATE TEMP TABLE IF NOT EXISTS touched_customers (customer_id INTEGER PRIMARY KEY)")
+    for year in sorted(set(changed) | set(removed)):
+        if incremental:
+            touched_years |= touch_year(conn, year)
+            cursor.execute("DELETE FROM transactions WHERE order_year = ?", (year,))
+        parquet_store.drop_partition(CLEAN_PATH, year)
+    for year in removed:
+        build_manifest.forget(conn, year)
+        cursor.execute("DELETE FROM year_kpis WHERE order_year = ?", (year,))
+
+    # -----------------------
+    # LOAD CHANGED YEARS
+    # -----------------------
+    # Each frame is appended to its year's Parquet partition and the
+    # transactions table as soon as it is cleaned, so serially only one frame (or chunk)
+    # is ever in memory, and in parallel about two per worker.
+    # Parsing and cleaning may run in worker processes, but this process is
+    # the only writer and owns the SQLite connection.
+    if workers > 1:
+        frames = ingest.ingest_parallel(changed, chunk_size, workers)
+    else:
+        frames = ingest.ingest_serial(changed, chunk_size)
+
+    # The whole load is one transaction: the reload of a changed year becomes
+    # visible to readers all at once, together with its derived tables.
+    row_counts = dict.fromkeys(changed, 0)
+    insert_seconds = 0.0
+    parquet_schema = parquet_store.arrow_schema(conn, "transactions", exclude=("order_year",))
+    parquet_writers = {}
+    # A row whose transaction_id is already stored, or that repeats an order
+    # already stored for its year (idx_dedup), is skipped. Executive KPIs
+    # and the Parquet partition are fed the rows SQLite actually stored, so
+    # all three agree. Those rows hold dimension codes, so the accumulators
+    # collect customer codes rather than id strings.
+    kpis = {year: KpiAccumulator() for year in changed}
+    skipped = 0
+    for year, frame in frames:
+        frame = encoder.encode(frame)
+        start = time.perf_counter()
+        stored = bulk_load.insert_new(conn, "transactions", frame)
+        insert_seconds += time.perf_counter() - start
+        row_counts[year] += len(stored)
+        skipped += len(frame) - len(stored)
+        kpis[year].update(stored)
+        parquet_store.write_frame(parquet_writers, CLEAN_PATH, year, stored, parquet_schema)
+
+    total_rows = sum(row_counts.values())
+    print(f"✅ Transactions loaded: {total_rows:,} rows across {len(changed)} year(s)")
+    if skipped:
+        print(f"⚠ {skipped:,} rows skipped: transaction_id or order already loaded")
+    print(f"⚡ Insert throughput: {total_rows / max(insert_seconds, 1e-9):,.0f} rows/sec")
+    parquet_store.close_writers(parquet_writers)
+    print("✅ Parquet partitions written to", os.path.join(CLEAN_PATH, "transactions"))
+
+    write_year_kpis(conn, kpis)
+    loaded = KpiAccumulator()
+    for accumulator in kpis.values():
+        loaded.merge(accumulator)
+    summary = loaded.result()
+    print(
+        f"📊 KPIs of loaded years: revenue ₹{summary['Total Revenue']:,.0f} · "
+        f"{summary['Active Customers']:,} customers · AOV ₹{summary['AOV']:,.0f} · "
+        f"Prime {summary['Prime %']:.1f}%"
+    )
+
+    load_products(conn, ingest, bulk_load, encoder)
+
+    # -----------------------
+    # REFRESH DERIVED TABLES
+    # -----------------------
+    if incremental:
+        for year in changed:
+            touched_years |= touch_year(conn, year)
+        refresh_customers(conn)
+        refresh_time_dimension(conn, ingest, bulk_load, touched_years)
+    else:
+        build_customers(conn)
+        refresh_time_dimension(conn, ingest, bulk_load)
+    print("✅ Customers table refreshed")
+    print("✅ Time dimension table refreshed")
+
+    # Categories come from the catalogue, so a new one rebuilds every year of the cube
+    rebuild_all = not incremental or products_changed
+    summary_cube.build_cube(conn, None if rebuild_all else sorted(set(changed) | set(removed)))
+    print("✅ Sales cube refreshed")
+
+    customer_sketch.build_sketches(conn, None if sketch_all else sorted(set(changed) | set(removed)))
+    print("✅ Customer sketches refreshed")
+
+    customer_rfm.build_rfm(conn, None if rfm_all else sorted(set(changed) | set(removed)))
+    print("✅ Customer RFM table refreshed")
+
+    cohorts.build_cohorts(conn)
+    print("✅ Customer cohorts refreshed")
+
+    column_stats.build_stats(conn)
+    print("✅ Column statistics catalogue refreshed")
+
+    for table in ("products", "sales_cube"):
+        parquet_store.export_table(conn, table, CLEAN_PATH)
+
+    for year, fp in fingerprints.items():
+        build_manifest.record(conn, year, fp, row_counts[year])
+    build_manifest.record_products(conn, products_fp)
+    version = bump_data_version(conn)
+
+    # -----------------------
+    # INDEXING FOR PERFORMANCE
+    # -----------------------
+    index_seconds = bulk_load.create_indexes(conn)
+    print(f"✅ Indexes built and statistics analyzed in {index_seconds:.2f}s")
+
+    conn.commit()
+    if not incremental:
+        conn.execute("PRAGMA journal_mode = WAL")
+    conn.close()
+
+    if not incremental:
+        publish(BUILD_PATH, DB_PATH, version)
+
+    # Fitted after the swap, so the dashboard never waits on a model fit
+    if forecast:
+        train_forecasts(workers)
+
+    print("\n🎉 DATABASE BUILD COMPLETE")
+    print("📦 Database file:", DB_PATH)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Build the Amazon India SQLite database")
+    parser.add_argument(
+        "--chunk-size", type=int, default=None,
+        help="stream each yearly file in chunks of this many rows "
+             "(memory bounded by about two chunks per worker; default reads each file whole)"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None,
+        help="parse and clean yearly files in this many processes (default: one per CPU)"
+    )
+    parser.add_argument(
+        "--full", action="store_true",
+        help="ignore the build manifest and rebuild every year from scratch"
+    )
+    parser.add_argument(
+        "--skip-forecasts", action="store_true",
+        help="do not refit the revenue forecasts (python forecasts.py does it later)"
+    )
+    args = parser.parse_args(argv)
+    if args.workers is None:
+        args.workers = os.cpu_count() or 1
+    return args
 
-conn.commit()
-conn.close()
 
-print("\n🎉 DATABASE BUILD COMPLETE")
-print("📦 Database file:", DB_PATH)
\ No newline at end of file
+if __name__ == "__main__":
+    args = parse_args()
+    build(chunk_size=args.chunk_size, workers=args.workers, full=args.full,
+          forecast=not args.skip_forecasts)
\ No newline at end of file
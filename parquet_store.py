@@ -0,0 +1,79 @@
+import os
+import shutil
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# -----------------------
+# COLUMNAR STORE
+# -----------------------
+# Cleaned transactions are written as hive-style year partitions
+# (transactions/order_year=2015/part-0.parquet), zstd-compressed with
+# per-row-group min/max statistics, so columnar engines can prune both
+# partitions and row groups. Column types follow schema.sql.
+
+COMPRESSION = "zstd"
+ROW_GROUP_SIZE = 1_000_000
+
+ARROW_TYPES = {
+    "TEXT": pa.string(),
+    "REAL": pa.float64(),
+    "INTEGER": pa.int64(),
+    "BOOLEAN": pa.bool_(),
+    "DATE": pa.date32(),
+}
+
+
+def arrow_schema(conn, table, exclude=()):
+    fields = [
+        (name, ARROW_TYPES[decl.upper()])
+        for _, name, decl, *_ in conn.execute(f"PRAGMA table_info({table})")
+        if name not in exclude
+    ]
+    return pa.schema(fields)
+
+
+def partition_dir(root, year):
+    return os.path.join(root, "transactions", f"order_year={year}")
+
+
+def drop_partition(root, year):
+    shutil.rmtree(partition_dir(root, year), ignore_errors=True)
+
+
+def write_frame(writers, root, year, frame, schema):
+    """Append a cleaned frame to its year's Parquet file, opening it on first use."""
+    if year not in writers:
+        os.makedirs(partition_dir(root, year), exist_ok=True)
+        writers[year] = pq.ParquetWriter(
+            os.path.join(partition_dir(root, year), "part-0.parquet"),
+            schema,
+            compression=COMPRESSION,
+            write_statistics=True,
+        )
+    table = pa.Table.from_pandas(
+        frame.reindex(columns=schema.names), schema=schema, preserve_index=False
+    )
+    writers[year].write_table(table, row_group_size=ROW_GROUP_SIZE)
+
+
+def close_writers(writers):
+    for writer in writers.values():
+        writer.close()
+    writers.clear()
+
+
+def export_table(conn, table, root):
+    """Snapshot a small SQLite table (products, sales_cube) to one Parquet file."""
+    df = pd.read_sql(f"SELECT * FROM {table}", conn)
+    schema = arrow_schema(conn, table)
+    for field in schema:
+        if field.type == pa.bool_():
+            # SQLite hands booleans back as 0/1 integers
+            df[field.name] = df[field.name].astype("boolean")
+    pq.write_table(
+        pa.Table.from_pandas(df, schema=schema, preserve_index=False),
+        os.path.join(root, f"{table}.parquet"),
+        compression=COMPRESSION,
+    )
\ No newline at end of file
@@ -0,0 +1,361 @@
+import json
+import os
+import threading
+import time
+
+import pandas as pd
+
+import customer_sketch
+import db
+import dimensions
+import disk_cache
+import query_log
+import result_cache
+from summary_cube import CUBE_DIMENSIONS
+
+PARQUET_PATH = os.path.join("data", "cleaned")
+
+# "sqlite" reads amazon_india.db; "duckdb" runs the same SQL over the
+# Parquet store written by load_data.py.
+BACKEND = os.environ.get("AMAZON_INDIA_BACKEND", "sqlite")
+
+# Measures the sales cube can answer, keyed by (function, column) as used in
+# the specs from sql_queries.py, mapped to their roll-up over sales_cube.
+CUBE_MEASURES = {
+    ("SUM", "final_amount_inr"): "SUM(revenue)",
+    ("COUNT", "*"): "SUM(orders)",
+    ("AVG", "final_amount_inr"): "SUM(revenue) / SUM(amount_count)",
+}
+
+# The unary + keeps SQLite from driving the join from products through
+# idx_product. Scanning transactions and looking up the integer products key
+# is about 3x faster.
+PRODUCT_JOIN = "transactions t JOIN products p ON +t.product_id = p.product_id"
+
+# Approximate distinct customers are merged from customer_sketches, which
+# load_data.py writes per (order_year, order_month)
+APPROX_CUSTOMERS = ("APPROX_COUNT_DISTINCT", "customer_id")
+SKETCH_FILTERS = ("order_year", "order_month")
+
+
+# -----------------------
+# EXECUTION
+# -----------------------
+_duckdb = None
+_duckdb_lock = threading.Lock()
+
+
+def get_duckdb():
+    """One in-process DuckDB database exposing the Parquet files as views."""
+    global _duckdb
+    with _duckdb_lock:
+        if _duckdb is None:
+            _duckdb = _open_duckdb()
+    return _duckdb
+
+
+def _open_duckdb():
+    try:
+        import duckdb
+    except ImportError as exc:
+        raise ImportError(
+            "AMAZON_INDIA_BACKEND=duckdb needs the duckdb package (pip install duckdb)"
+        ) from exc
+
+    con = duckdb.connect()
+    transactions = os.path.join(PARQUET_PATH, "transactions", "*", "*.parquet")
+    con.execute(
+        "CREATE VIEW transactions AS "
+        f"SELECT * FROM read_parquet('{transactions}', hive_partitioning = true)"
+    )
+    for table in ("products", "sales_cube"):
+        path = os.path.join(PARQUET_PATH, f"{table}.parquet")
+        con.execute(f"CREATE VIEW {table} AS SELECT * FROM read_parquet('{path}')")
+    return con
+
+
+def run_query(sql, params=(), backend=None):
+    """
+    Run SQL on the configured backend through two cache tiers: the
+    in-process result cache, then the on-disk cache shared by every process.
+    Dimension codes in the result are replaced by labels before caching.
+    Every call is timed and recorded in query_log.
+    """
+    backend = backend or BACKEND
+    start = time.perf_counter()
+    version = db.data_version()
+    key = (backend, sql, tuple(params))
+
+    source = "memory"
+    df = result_cache.get(key, version)
+    if df is None:
+        source = "disk"
+        disk_key = disk_cache.cache_key(backend, sql, params, version)
+        df = disk_cache.get(disk_key)
+        if df is None:
+            source = "executed"
+            df = dimensions.decode(execute(sql, params, backend), run_query)
+            disk_cache.put(disk_key, version, sql, params, df)
+        result_cache.put(key, version, df)
+    query_log.record(backend, sql, params, len(df), time.perf_counter() - start, source)
+    return df
+
+
+def execute(sql, params=(), backend=None):
+    backend = backend or BACKEND
+    if backend == "duckdb":
+        # A cursor is an independent connection to the same database, so
+        # concurrent Streamlit sessions do not share statement state
+        return get_duckdb().cursor().execute(sql, list(params)).df()
+    if backend != "sqlite":
+        raise ValueError(f"Unknown query backend: {backend}")
+
+    with db.connection() as conn:
+        return pd.read_sql(sql, conn, params=list(params))
+
+
+# -----------------------
+# AGGREGATE ROUTING
+# -----------------------
+def cube_can_answer(group_by, measures, where):
+    """True when every grouping, filter and measure can be rolled up from the cube."""
+    if not (set(group_by) | set(where)) <= set(CUBE_DIMENSIONS):
+        return False
+    for func, column in measures.values():
+        if (func, column) in CUBE_MEASURES:
+            continue
+        if func in ("MIN", "MAX") and column in CUBE_DIMENSIONS:
+            continue
+        return False
+    return True
+
+
+def measure_sql(func, column, on_cube):
+    if on_cube and (func, column) in CUBE_MEASURES:
+        return CUBE_MEASURES[(func, column)]
+    if func in ("COUNT_DISTINCT", "APPROX_COUNT_DISTINCT"):
+        # Without sketches an approximate count falls back to the exact one
+        return f"COUNT(DISTINCT {column})"
+    return f"{func}({column})"
+
+
+def plain(value):
+    """numpy scalars (e.g. from DataFrame columns) as plain Python values."""
+    return value.item() if hasattr(value, "item") else value
+
+
+def _encode(column, labels, conn=None):
+    """
+    Sorted dimension codes for sorted labels; an unknown label matches nothing.
+    Looked up on `conn` when given, else through run_query and its caches.
+    """
+    if conn is None:
+        run = run_query
+    else:
+        def run(sql, params, backend=None):
+            return pd.read_sql(sql, conn, params=params)
+    codes = dimensions.codes_for(column, labels, run)
+    if codes is None:
+        return labels
+    return sorted({codes.get(label, -1) for label in labels})
+
+
+def _is_int_range(values):
+    return (
+        all(isinstance(v, int) for v in values)
+        and values[-1] - values[0] + 1 == len(values)
+    )
+
+
+def where_sql(where, backend=None, conn=None):
+    """
+    Turn {column: value or collection of values} into SQL clauses and parameters.
+
+    Labels of dictionary-encoded columns (see dimensions.py) are replaced by
+    their codes. Collections are de-duplicated and sorted. A contiguous run
+    of integers becomes BETWEEN, and any other set is bound as one array
+    parameter. The SQL text therefore depends only on which columns are
+    filtered, never on how many values are selected, so prepared statements
+    and cache entries are shared. Codes are read from `conn` when given,
+    otherwise from the dashboard's database (db.DB_PATH).
+    """
+    backend = backend or BACKEND
+    clauses, params = [], []
+    for column, value in where.items():
+        if isinstance(value, (list, tuple, set)):
+            values = sorted({plain(v) for v in value})
+            if not values:
+                # An empty multiselect means "no filter", not "no rows"
+                continue
+            if column in dimensions.DIMENSIONS:
+                values = _encode(column, values, conn)
+            if _is_int_range(values):
+                clauses.append(f"{column} BETWEEN ? AND ?")
+                params.extend([values[0], values[-1]])
+            elif backend == "duckdb":
+                clauses.append(f"{column} IN (SELECT unnest(?))")
+                params.append(tuple(values))
+            else:
+                clauses.append(f"{column} IN (SELECT value FROM json_each(?))")
+                params.append(json.dumps(values))
+        else:
+            value = plain(value)
+            if column in dimensions.DIMENSIONS:
+                value = _encode(column, [value], conn)[0]
+            clauses.append(f"{column} = ?")
+            params.append(value)
+    return clauses, params
+
+
+def aggregate_sql(group_by=(), measures=None, where=None, order_by=None, limit=None,
+                  use_cube=True, backend=None, conn=None):
+    """
+    Build (sql, params) for an aggregate spec.
+
+    The query reads sales_cube when the spec can be rolled up from it and
+    falls back to transactions (joined to products for `category`) otherwise.
+    """
+    measures = measures or {}
+    where = where or {}
+    on_cube = use_cube and cube_can_answer(group_by, measures, where)
+
+    if on_cube:
+        source = "sales_cube"
+    elif "category" in set(group_by) | set(where):
+        source = PRODUCT_JOIN
+    else:
+        source = "transactions"
+
+    select = list(group_by) + [
+        f"{measure_sql(func, column, on_cube)} AS {alias}"
+        for alias, (func, column) in measures.items()
+    ]
+    clauses, params = where_sql(where, backend, conn)
+    if on_cube and "category" in group_by:
+        # The cube LEFT JOINs products; keep the inner-join semantics of the
+        # transactions query by dropping rows without a catalogue match
+        clauses.append("category IS NOT NULL")
+
+    sql = f"SELECT {', '.join(select)} FROM {source}"
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    if group_by:
+        sql += " GROUP BY " + ", ".join(group_by)
+    if order_by:
+        sql += f" ORDER BY {order_by}"
+    if limit:
+        sql += f" LIMIT {int(limit)}"
+    return sql, params
+
+
+def aggregate(group_by=(), measures=None, where=None, order_by=None, limit=None,
+              backend=None):
+    where = prune_filters(where or {})
+    if sketch_can_answer(group_by, measures or {}, where):
+        df = sketch_aggregate(measures, where)
+        if df is not None:
+            return df
+    sql, params = aggregate_sql(group_by, measures, where, order_by, limit, backend=backend)
+    return run_query(sql, params, backend)
+
+
+# -----------------------
+# STATISTICS CATALOGUE
+# -----------------------
+# Catalogue tables live in amazon_india.db whichever backend runs the data
+# queries.
+def column_stats(column):
+    """min_value, max_value, null_count, distinct_count and row_count, or None."""
+    try:
+        df = run_query(
+            "SELECT * FROM column_stats WHERE column_name = ?", [column], backend="sqlite"
+        )
+    except pd.errors.DatabaseError:
+        # Database built before the catalogue existed
+        return None
+    return df.iloc[0] if len(df) else None
+
+
+def column_values(column, by="value"):
+    """A column's most frequent values with row counts, sorted by value or frequency."""
+    order = "frequency DESC" if by == "frequency" else "value"
+    return run_query(
+        f"SELECT value, frequency FROM column_top_values WHERE column_name = ? ORDER BY {order}",
+        [column], backend="sqlite",
+    )
+
+
+def prune_filters(where):
+    """Drop empty list filters and those that select every value of a NULL-free column."""
+    pruned = {}
+    for column, value in where.items():
+        if isinstance(value, (list, tuple, set)):
+            if not value:
+                continue
+            stats = column_stats(column)
+            if stats is not None and stats.null_count == 0:
+                values = set(column_values(column)["value"].tolist())
+                # Only when the catalogue lists every distinct value
+                if len(values) == stats.distinct_count and set(value) == values:
+                    continue
+        pruned[column] = value
+    return pruned
+
+
+# -----------------------
+# SKETCH ROUTING
+# -----------------------
+_sketches = {"version": None, "registers": None}
+_sketch_lock = threading.Lock()
+
+
+def sketch_can_answer(group_by, measures, where):
+    return (
+        not group_by
+        and bool(measures)
+        and all(measure == APPROX_CUSTOMERS for measure in measures.values())
+        and set(where) <= set(SKETCH_FILTERS)
+    )
+
+
+def load_sketches():
+    """Sketch registers for the current data version, read once per build."""
+    version = db.data_version()
+    with _sketch_lock:
+        if _sketches["version"] != version or _sketches["registers"] is None:
+            with db.connection() as conn:
+                _sketches["registers"] = customer_sketch.read_sketches(conn)
+            _sketches["version"] = version
+        return _sketches["registers"]
+
+
+def _matches(value, wanted):
+    if isinstance(wanted, (list, tuple, set)):
+        return not wanted or value in wanted
+    return value == wanted
+
+
+def sketch_aggregate(measures, where):
+    """Merge the sketches matching `where`; None when the database has none."""
+    start = time.perf_counter()
+    registers = load_sketches()
+    if registers is None:
+        return None
+    selected = [
+        sketch
+        for (year, month), sketch in registers.items()
+        if all(_matches({"order_year": year, "order_month": month}[column], wanted)
+               for column, wanted in where.items())
+    ]
+    count = round(customer_sketch.estimate(customer_sketch.merge(selected)))
+    df = pd.DataFrame({alias: [count] for alias in measures})
+
+    # Logged as the query it stands in for
+    label = "SELECT " + ", ".join(
+        f"APPROX_COUNT_DISTINCT(customer_id) AS {alias}" for alias in measures
+    ) + " FROM customer_sketches"
+    if where:
+        label += " WHERE " + " AND ".join(f"{column} IN (?)" for column in where)
+    query_log.record("sketch", label, list(where.values()), len(df),
+                     time.perf_counter() - start, "sketch")
+    return df
\ No newline at end of file
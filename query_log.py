@@ -0,0 +1,120 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from logging.handlers import RotatingFileHandler
+
+import numpy as np
+import pandas as pd
+
+# -----------------------
+# QUERY INSTRUMENTATION
+# -----------------------
+# query_layer calls record() once per query a page asks for, with the SQL,
+# parameters, rows returned, wall time and where the result came from:
+# "memory" or "disk" (cache hits), "sketch" (merged HyperLogLog sketches) or
+# "executed" (a cache miss run on the backend). Queries are grouped by
+# fingerprint, a hash of the whitespace-normalized SQL; since filters are
+# bound as parameters, every filter selection of a panel shares one
+# fingerprint. The last SAMPLE_SIZE timings per fingerprint are kept in
+# memory for p50/p95. Queries slower than SLOW_MS are also appended to
+# SLOW_LOG as JSON lines.
+
+SLOW_MS = float(os.environ.get("AMAZON_INDIA_SLOW_MS", "250"))
+SLOW_LOG = os.environ.get("AMAZON_INDIA_SLOW_LOG", "slow_queries.log")
+SAMPLE_SIZE = 1000
+
+CACHE_HITS = ("memory", "disk")
+
+_lock = threading.Lock()
+_queries = {}                                      # fingerprint -> SQL text
+_timings = defaultdict(lambda: deque(maxlen=SAMPLE_SIZE))
+_counts = defaultdict(lambda: defaultdict(int))    # fingerprint -> source -> calls
+_rows = defaultdict(int)
+_params = {}                                       # fingerprint -> last parameters
+
+_slow_log = None
+
+
+def fingerprint(sql):
+    normalized = " ".join(sql.split())
+    return hashlib.sha1(normalized.encode()).hexdigest()[:12], normalized
+
+
+def slow_logger():
+    """A size-capped JSON-lines log, opened on the first slow query."""
+    global _slow_log
+    if _slow_log is None:
+        logger = logging.getLogger("amazon_india.slow_queries")
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        if not logger.handlers:
+            handler = RotatingFileHandler(SLOW_LOG, maxBytes=10 * 1024 * 1024, backupCount=3)
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            logger.addHandler(handler)
+        _slow_log = logger
+    return _slow_log
+
+
+def record(backend, sql, params, rows, seconds, source):
+    key, normalized = fingerprint(sql)
+    ms = seconds * 1000
+    with _lock:
+        _queries[key] = normalized
+        _timings[key].append(ms)
+        _counts[key][source] += 1
+        _rows[key] += rows
+        _params[key] = list(params)
+
+    if ms >= SLOW_MS:
+        slow_logger().info(json.dumps({
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "fingerprint": key,
+            "backend": backend,
+            "source": source,
+            "ms": round(ms, 3),
+            "rows": rows,
+            "sql": normalized,
+            "params": list(params),
+        }, default=str))
+
+
+def summary():
+    """One row per fingerprint: calls, cache hit rate, rows and latency percentiles."""
+    with _lock:
+        snapshot = [
+            (key, sql, list(_timings[key]), dict(_counts[key]), _rows[key], _params[key])
+            for key, sql in _queries.items()
+        ]
+    rows = []
+    for key, sql, timings, counts, total_rows, params in snapshot:
+        calls = sum(counts.values())
+        hits = sum(counts.get(source, 0) for source in CACHE_HITS)
+        rows.append({
+            "fingerprint": key,
+            "sql": sql,
+            "last_params": json.dumps(params, default=str),
+            "calls": calls,
+            "hit_rate": hits / calls,
+            "executed": counts.get("executed", 0),
+            "sketch": counts.get("sketch", 0),
+            "avg_rows": total_rows / calls,
+            "p50_ms": float(np.percentile(timings, 50)),
+            "p95_ms": float(np.percentile(timings, 95)),
+            "max_ms": max(timings),
+        })
+    columns = ["fingerprint", "sql", "last_params", "calls", "hit_rate", "executed", "sketch",
+               "avg_rows", "p50_ms", "p95_ms", "max_ms"]
+    return pd.DataFrame(rows, columns=columns).sort_values("p95_ms", ascending=False)
+
+
+def clear():
+    with _lock:
+        _queries.clear()
+        _timings.clear()
+        _counts.clear()
+        _rows.clear()
+        _params.clear()
\ No newline at end of file
@@ -0,0 +1,67 @@
+import os
+import threading
+from collections import OrderedDict
+
+# -----------------------
+# DATA-VERSION-AWARE RESULT CACHE
+# -----------------------
+# Query results are keyed by (backend, SQL, parameters, data_version). An
+# entry stays valid until load_data.py writes a new data_version, so nothing
+# is recomputed on a timer. Entries are evicted least-recently-used once
+# their combined memory exceeds the budget.
+
+BUDGET_BYTES = int(os.environ.get("AMAZON_INDIA_CACHE_MB", "256")) * 1024 * 1024
+
+_entries = OrderedDict()   # key -> (DataFrame, size in bytes)
+_lock = threading.Lock()
+_version = None
+_stats = {"hits": 0, "misses": 0, "evictions": 0, "bytes": 0}
+
+
+def _sync_version(version):
+    """Drop every entry as soon as a new data version is seen."""
+    global _version
+    if version != _version:
+        _entries.clear()
+        _stats["bytes"] = 0
+        _version = version
+
+
+def get(key, version):
+    with _lock:
+        _sync_version(version)
+        entry = _entries.get(key)
+        if entry is None:
+            _stats["misses"] += 1
+            return None
+        _entries.move_to_end(key)
+        _stats["hits"] += 1
+    # Callers may mutate what they get back (e.g. relabelling columns)
+    return entry[0].copy()
+
+
+def put(key, version, df):
+    size = int(df.memory_usage(index=True, deep=True).sum())
+    if size > BUDGET_BYTES:
+        return
+    with _lock:
+        _sync_version(version)
+        if key in _entries:
+            _stats["bytes"] -= _entries.pop(key)[1]
+        _entries[key] = (df.copy(), size)
+        _stats["bytes"] += size
+        while _stats["bytes"] > BUDGET_BYTES:
+            _, (_, evicted) = _entries.popitem(last=False)
+            _stats["bytes"] -= evicted
+            _stats["evictions"] += 1
+
+
+def stats():
+    with _lock:
+        return dict(_stats, entries=len(_entries), budget_bytes=BUDGET_BYTES)
+
+
+def clear():
+    with _lock:
+        _entries.clear()
+        _stats.update(hits=0, misses=0, evictions=0, bytes=0)
\ No newline at end of file
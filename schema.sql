@@ -1,42 +1,190 @@
+-- Dictionary dimensions: integer surrogate codes for repeated text columns.
+-- Every other table stores the code under the original column name (see
+-- dimensions.py).
+CREATE TABLE IF NOT EXISTS dim_customer (
+    code INTEGER PRIMARY KEY,
+    label TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS dim_product (
+    code INTEGER PRIMARY KEY,
+    label TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS dim_city (
+    code INTEGER PRIMARY KEY,
+    label TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS dim_state (
+    code INTEGER PRIMARY KEY,
+    label TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS dim_payment (
+    code INTEGER PRIMARY KEY,
+    label TEXT NOT NULL UNIQUE
+);
+
 CREATE TABLE IF NOT EXISTS products (
-    product_id TEXT PRIMARY KEY,
+    product_id INTEGER PRIMARY KEY,
     product_name TEXT,
     category TEXT,
     subcategory TEXT,
     brand TEXT,
     base_price_2015 REAL,
+    weight_kg REAL,
+    rating REAL,
     is_prime_eligible BOOLEAN,
-    launch_year INTEGER
+    launch_year INTEGER,
+    model TEXT
 );
 
 CREATE TABLE IF NOT EXISTS customers (
-    customer_id TEXT PRIMARY KEY,
-    customer_city TEXT,
-    customer_state TEXT,
+    customer_id INTEGER PRIMARY KEY,
+    customer_city INTEGER,
+    customer_state INTEGER,
     age_group TEXT,
-    customer_spending_tier TEXT
+    customer_spending_tier TEXT,
+    is_prime_member BOOLEAN
+);
+
+CREATE TABLE IF NOT EXISTS time_dimension (
+    date DATE PRIMARY KEY,
+    year INTEGER,
+    month INTEGER,
+    quarter TEXT,
+    day INTEGER
 );
 
 CREATE TABLE IF NOT EXISTS transactions (
     transaction_id TEXT PRIMARY KEY,
-    customer_id TEXT,
-    product_id TEXT,
+    customer_id INTEGER,
+    product_id INTEGER,
     order_date DATE,
     order_year INTEGER,
     order_month INTEGER,
+    original_price_inr REAL,
     final_amount_inr REAL,
     discount_percent REAL,
-    payment_method TEXT,
+    customer_city INTEGER,
+    customer_state INTEGER,
+    payment_method INTEGER,
     delivery_days INTEGER,
     return_status TEXT,
     customer_rating REAL,
     is_prime_member BOOLEAN,
     is_festival_sale BOOLEAN,
     festival_name TEXT,
-    FOREIGN KEY(customer_id) REFERENCES customers(customer_id),
-    FOREIGN KEY(product_id) REFERENCES products(product_id)
+    FOREIGN KEY(customer_id) REFERENCES dim_customer(code),
+    FOREIGN KEY(product_id) REFERENCES dim_product(code),
+    FOREIGN KEY(customer_city) REFERENCES dim_city(code),
+    FOREIGN KEY(customer_state) REFERENCES dim_state(code),
+    FOREIGN KEY(payment_method) REFERENCES dim_payment(code)
+);
+
+-- One row per order within a year partition: the key of
+-- data_cleaning.remove_duplicates, with NULLs made equal as pandas treats
+-- them. Created with the table, not deferred like the indexes below, so a
+-- repeated order in a later chunk of the same file is skipped on insert.
+CREATE UNIQUE INDEX IF NOT EXISTS idx_dedup ON transactions(
+    order_year,
+    IFNULL(customer_id, ''),
+    IFNULL(product_id, ''),
+    IFNULL(order_date, ''),
+    IFNULL(final_amount_inr, '')
+);
+
+-- Pre-aggregated sales cube, rebuilt per year partition at load time.
+-- amount_count counts non-NULL amounts so AVG can be rolled up exactly.
+CREATE TABLE IF NOT EXISTS sales_cube (
+    order_year INTEGER,
+    order_month INTEGER,
+    customer_city INTEGER,
+    customer_state INTEGER,
+    payment_method INTEGER,
+    is_prime_member BOOLEAN,
+    category TEXT,
+    revenue REAL,
+    orders INTEGER,
+    amount_count INTEGER
+);
+
+-- HyperLogLog sketches of customer IDs per month (see customer_sketch.py)
+CREATE TABLE IF NOT EXISTS customer_sketches (
+    order_year INTEGER,
+    order_month INTEGER,
+    registers BLOB,
+    PRIMARY KEY (order_year, order_month)
+);
+
+-- Per-customer RFM inputs (see customer_rfm.py)
+CREATE TABLE IF NOT EXISTS customer_rfm_yearly (
+    customer_id INTEGER,
+    order_year INTEGER,
+    last_order_date DATE,
+    frequency INTEGER,
+    monetary REAL,
+    PRIMARY KEY (customer_id, order_year)
+);
+
+CREATE TABLE IF NOT EXISTS customer_rfm (
+    customer_id INTEGER PRIMARY KEY,
+    last_order_date DATE,
+    frequency INTEGER,
+    monetary REAL
+);
+
+-- Customers, revenue and orders per first-order month and months since it
+-- (see cohorts.py)
+CREATE TABLE IF NOT EXISTS customer_cohorts (
+    cohort_month TEXT,
+    months_since INTEGER,
+    customers INTEGER,
+    revenue REAL,
+    orders INTEGER,
+    PRIMARY KEY (cohort_month, months_since)
+);
+
+-- Executive KPI accumulator state per order year, collected while each
+-- file is ingested (see kpi.KpiAccumulator). Revenue, AOV and Prime % merge
+-- across years, while active_customers counts distinct customers within the year.
+CREATE TABLE IF NOT EXISTS year_kpis (
+    order_year INTEGER PRIMARY KEY,
+    revenue REAL,
+    amount_count INTEGER,
+    prime_sum REAL,
+    prime_count INTEGER,
+    active_customers INTEGER
+);
+
+-- Column statistics catalogue (see column_stats.py)
+CREATE TABLE IF NOT EXISTS column_stats (
+    column_name TEXT PRIMARY KEY,
+    min_value,
+    max_value,
+    null_count INTEGER,
+    distinct_count INTEGER,
+    row_count INTEGER
+);
+
+CREATE TABLE IF NOT EXISTS column_top_values (
+    column_name TEXT,
+    value,
+    frequency INTEGER,
+    PRIMARY KEY (column_name, value)
+);
+
+-- Build metadata: data_version changes on every build that alters data
+CREATE TABLE IF NOT EXISTS build_info (
+    key TEXT PRIMARY KEY,
+    value TEXT
 );
 
-CREATE INDEX idx_year ON transactions(order_year);
-CREATE INDEX idx_customer ON transactions(customer_id);
-CREATE INDEX idx_product ON transactions(product_id);
\ No newline at end of file
+CREATE INDEX IF NOT EXISTS idx_year ON transactions(order_year);
+CREATE INDEX IF NOT EXISTS idx_date ON transactions(order_date);
+CREATE INDEX IF NOT EXISTS idx_customer ON transactions(customer_id);
+CREATE INDEX IF NOT EXISTS idx_product ON transactions(product_id);
+CREATE INDEX IF NOT EXISTS idx_year_delivery ON transactions(order_year, delivery_days);
+CREATE INDEX IF NOT EXISTS idx_cube_year ON sales_cube(order_year, order_month);
+CREATE INDEX IF NOT EXISTS idx_rfm_year ON customer_rfm_yearly(order_year);
\ No newline at end of file
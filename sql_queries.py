@@ -1,16 +1,105 @@
+# Dashboard aggregate specs. Each function returns keyword arguments for
+# query_layer.aggregate(), which answers them from sales_cube whenever the
+# grouping can be rolled up and from transactions otherwise. Filter widget
+# values come from the statistics catalogue (query_layer.column_values).
+
+REVENUE = ("SUM", "final_amount_inr")
+ORDERS = ("COUNT", "*")
+AVG_ORDER_VALUE = ("AVG", "final_amount_inr")
+ACTIVE_CUSTOMERS = ("COUNT_DISTINCT", "customer_id")
+APPROX_ACTIVE_CUSTOMERS = ("APPROX_COUNT_DISTINCT", "customer_id")
+
+
 def revenue_by_year():
-    return """
-    SELECT order_year, SUM(final_amount_inr) revenue
-    FROM transactions
-    GROUP BY order_year
-    ORDER BY order_year
-    """
+    return {
+        "group_by": ["order_year"],
+        "measures": {"revenue": REVENUE},
+        "order_by": "order_year",
+    }
+
 
 def top_categories():
-    return """
-    SELECT category, SUM(final_amount_inr) revenue
-    FROM transactions t
-    JOIN products p ON t.product_id = p.product_id
-    GROUP BY category
-    ORDER BY revenue DESC
-    """
\ No newline at end of file
+    return {
+        "group_by": ["category"],
+        "measures": {"revenue": REVENUE},
+        "order_by": "revenue DESC",
+    }
+
+
+def sales_totals():
+    return {
+        "measures": {
+            "revenue": REVENUE,
+            "orders": ORDERS,
+            "aov": AVG_ORDER_VALUE,
+        }
+    }
+
+
+def active_customers(exact=False):
+    """Distinct customers: a HyperLogLog estimate (~0.8% standard error) unless exact."""
+    return {"measures": {"customers": ACTIVE_CUSTOMERS if exact else APPROX_ACTIVE_CUSTOMERS}}
+
+
+def top_cities(limit=10):
+    return {
+        "group_by": ["customer_city"],
+        "measures": {"revenue": REVENUE},
+        "order_by": "revenue DESC",
+        "limit": limit,
+    }
+
+
+def payment_distribution():
+    return {
+        "group_by": ["payment_method"],
+        "measures": {"orders": ORDERS},
+        "order_by": "orders DESC",
+    }
+
+
+def payment_revenue_by_year():
+    return {
+        "group_by": ["order_year", "payment_method"],
+        "measures": {"revenue": REVENUE},
+        "order_by": "order_year",
+    }
+
+
+def prime_analysis():
+    return {
+        "group_by": ["is_prime_member"],
+        "measures": {"avg_order_value": AVG_ORDER_VALUE, "orders": ORDERS},
+        "order_by": "is_prime_member",
+    }
+
+
+def monthly_revenue():
+    return {
+        "group_by": ["order_month"],
+        "measures": {"revenue": REVENUE},
+        "order_by": "order_month",
+    }
+
+
+def delivery_distribution():
+    return {
+        "group_by": ["delivery_days"],
+        "measures": {"orders": ORDERS},
+        "order_by": "delivery_days",
+    }
+
+
+def dashboard_specs():
+    """Every aggregate the dashboard pages issue, keyed by name (for tooling)."""
+    return {
+        "sales_totals": sales_totals(),
+        "active_customers": active_customers(),
+        "revenue_by_year": revenue_by_year(),
+        "monthly_revenue": monthly_revenue(),
+        "top_cities": top_cities(),
+        "top_categories": top_categories(),
+        "payment_distribution": payment_distribution(),
+        "prime_analysis": prime_analysis(),
+        "delivery_distribution": delivery_distribution(),
+    }
\ No newline at end of file
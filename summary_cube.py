@@ -0,0 +1,46 @@
+# -----------------------
+# MATERIALIZED SALES CUBE
+# -----------------------
+# sales_cube holds SUM/COUNT of transactions grouped by every dimension the
+# dashboards filter or group on, so any aggregate over a subset of those
+# dimensions is rolled up from the cube instead of scanning transactions.
+
+CUBE_DIMENSIONS = (
+    "order_year",
+    "order_month",
+    "customer_city",
+    "customer_state",
+    "payment_method",
+    "is_prime_member",
+    "category",
+)
+
+_DIMENSION_EXPR = {dim: f"t.{dim}" for dim in CUBE_DIMENSIONS}
+_DIMENSION_EXPR["category"] = "p.category"
+
+
+def build_cube(conn, years=None):
+    """(Re)build cube rows for the given order years, or all of them when None."""
+    where, params = "", []
+    if years is None:
+        conn.execute("DELETE FROM sales_cube")
+    else:
+        years = sorted(years)
+        if not years:
+            return
+        marks = ",".join("?" * len(years))
+        conn.execute(f"DELETE FROM sales_cube WHERE order_year IN ({marks})", years)
+        where, params = f"WHERE t.order_year IN ({marks})", years
+
+    select_dims = ", ".join(_DIMENSION_EXPR[dim] for dim in CUBE_DIMENSIONS)
+    conn.execute(f"""
+        INSERT INTO sales_cube ({", ".join(CUBE_DIMENSIONS)}, revenue, orders, amount_count)
+        SELECT {select_dims},
+               SUM(t.final_amount_inr),
+               COUNT(*),
+               COUNT(t.final_amount_inr)
+        FROM transactions t
+        LEFT JOIN products p ON t.product_id = p.product_id
+        {where}
+        GROUP BY {select_dims}
+    """, params)
\ No newline at end of file
@@ -0,0 +1,137 @@
+import json
+
+import pandas as pd
+import streamlit as st
+
+import db
+import dimensions
+import query_layer
+
+# -----------------------
+# TRANSACTION BROWSER
+# -----------------------
+# Keyset pagination over transactions. Each page holds the next PAGE_SIZE rows
+# after the last (sort value, rowid) already shown. SQLite seeks straight to
+# that key in the sort column's index, so page 10,000 costs the same as page 1.
+# LIMIT/OFFSET would read and discard every earlier row. Only the picked
+# columns are selected. Pages always read SQLite, because the Parquet store
+# has no rowid and no indexes. Each page is read once, so pages bypass the
+# query caches; only the small code-to-label lookups go through them.
+
+PAGE_SIZE = 200
+
+# Rows kept on screen. Older pages are dropped as new ones load, so each
+# "Load more" costs the same however deep the user has scrolled.
+MAX_ROWS = 2_000
+
+COLUMNS = [
+    "transaction_id", "order_date", "customer_id", "product_id",
+    "original_price_inr", "final_amount_inr", "discount_percent",
+    "customer_city", "customer_state", "payment_method", "delivery_days",
+    "return_status", "customer_rating", "is_prime_member", "is_festival_sale",
+    "festival_name",
+]
+DEFAULT_COLUMNS = [
+    "transaction_id", "order_date", "customer_id", "product_id",
+    "final_amount_inr", "customer_city", "payment_method",
+]
+
+# Sort choices. Each is served by an index whose entries end in rowid, so
+# (column, rowid) is a unique, seekable key. Rows whose sort column is NULL
+# are left out when sorting by that column.
+SORT_KEYS = {
+    "Load order": "rowid",
+    "Order date": "order_date",
+    "Transaction ID": "transaction_id",
+}
+
+# The page walks the sort index and stops after `limit` matches. Given a
+# selective filter, the planner would rather search idx_year and sort every
+# match, which makes deep pages cost as much as the whole filtered set.
+SORT_INDEXES = {
+    "order_date": "idx_date",
+    "transaction_id": "sqlite_autoindex_transactions_1",
+}
+
+
+def page_sql(columns, where, sort="rowid", descending=False, after=None, limit=PAGE_SIZE,
+             conn=None):
+    """
+    (sql, params) for the page after `after`, a (sort value, rowid) key, or
+    for the first page when `after` is None.
+    """
+    clauses, params = query_layer.where_sql(where, backend="sqlite", conn=conn)
+    key = ["rowid"] if sort == "rowid" else [sort, "rowid"]
+    if sort != "rowid":
+        clauses.append(f"{sort} IS NOT NULL")
+    if after is not None:
+        op = "<" if descending else ">"
+        if sort == "rowid":
+            clauses.append(f"rowid {op} ?")
+            params.append(after[1])
+        else:
+            clauses.append(f"({sort}, rowid) {op} (?, ?)")
+            params.extend(after)
+
+    select = ["rowid AS row_key"] + [c for c in columns if c != sort]
+    if sort != "rowid":
+        select.insert(1, sort)
+    direction = " DESC" if descending else ""
+    indexed_by = f" INDEXED BY {SORT_INDEXES[sort]}" if sort in SORT_INDEXES else ""
+    where_clause = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+    sql = (
+        f"SELECT {', '.join(select)} FROM transactions{indexed_by}{where_clause} "
+        f"ORDER BY {', '.join(k + direction for k in key)} LIMIT ?"
+    )
+    return sql, params + [limit]
+
+
+def fetch_page(columns, where, sort="rowid", descending=False, after=None, limit=PAGE_SIZE):
+    """(page frame, key of the next page or None after the last page)."""
+    with db.connection() as conn:
+        sql, params = page_sql(columns, where, sort, descending, after, limit, conn)
+        page = pd.read_sql(sql, conn, params=params)
+    page = dimensions.decode(page, query_layer.run_query)
+    if len(page) < limit:
+        return page, None
+    last = page.iloc[-1]
+    value = None if sort == "rowid" else query_layer.plain(last[sort])
+    return page, (value, int(last["row_key"]))
+
+
+# -----------------------
+# STREAMLIT PANEL
+# -----------------------
+@st.fragment
+def show(where):
+    """Browser panel. Loading a page reruns only this fragment, not the page."""
+    columns = st.multiselect("Columns", COLUMNS, default=DEFAULT_COLUMNS, key="browse_columns")
+    c1, c2 = st.columns(2)
+    sort = SORT_KEYS[c1.selectbox("Sort by", list(SORT_KEYS), key="browse_sort")]
+    descending = c2.toggle("Descending", key="browse_descending")
+    if not columns:
+        st.caption("Pick at least one column")
+        return
+
+    # Any change of filters, columns or sort starts again from the first page
+    view = json.dumps([where, columns, sort, descending], sort_keys=True, default=str)
+    state = st.session_state.get("browse")
+    if state is None or state["view"] != view:
+        page, after = fetch_page(columns, where, sort, descending)
+        state = st.session_state["browse"] = {
+            "view": view, "pages": [page], "after": after, "skipped": 0,
+        }
+
+    if state["after"] is not None and st.button("⬇ Load more", key="browse_more"):
+        page, state["after"] = fetch_page(columns, where, sort, descending, state["after"])
+        state["pages"].append(page)
+        while sum(len(p) for p in state["pages"]) > MAX_ROWS:
+            state["skipped"] += len(state["pages"].pop(0))
+
+    shown = pd.concat(state["pages"], ignore_index=True)
+    first = state["skipped"] + 1
+    st.caption(
+        f"Rows {first:,}–{state['skipped'] + len(shown):,}"
+        + ("" if state["after"] is not None else " (end)")
+    )
+    st.dataframe(shown[columns], hide_index=True)
\ No newline at end of file